@@ -1,9 +1,21 @@
 import streamlit as st
-import tempfile
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from backend import summarize_text, evaluate_summary_quality
-from utils.file_reader import extract_text_from_file, get_file_info, get_supported_formats
+# backend (google.generativeai) and the extractors are imported inside the functions
+# that use them, so the page renders before those heavy imports run
+from utils.file_reader import get_supported_formats
+
+# Optional fast hashers for upload cache keys (fall back to hashlib.blake2b)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 # Page configuration
 st.set_page_config(
@@ -14,7 +26,10 @@ st.set_page_config(
 )
 
 # Custom CSS for modern, bold styling
-st.markdown("""
+@st.cache_resource
+def _css() -> str:
+    """Return the page stylesheet, built once per process."""
+    return """
 <style>
     /* Modern color scheme */
     :root {
@@ -59,73 +74,6 @@ st.markdown("""
     
 
     
-    /* File info display */
-    .file-info {
-        background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%);
-        border: 2px solid var(--primary-color);
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        position: relative;
-        overflow: hidden;
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-        box-shadow: 0 6px 20px rgba(99, 102, 241, 0.15);
-        transition: all 0.3s ease;
-    }
-    
-    .file-info:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 12px 35px rgba(99, 102, 241, 0.25);
-    }
-    
-    .file-info::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: linear-gradient(90deg, var(--primary-color), var(--secondary-color));
-    }
-    
-    .file-info .file-icon {
-        font-size: 2.5rem;
-        color: var(--primary-color);
-        flex-shrink: 0;
-    }
-    
-    .file-info .file-details {
-        flex: 1;
-    }
-    
-    .file-info .file-name {
-        font-size: 1.1rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin-bottom: 0.4rem;
-        display: block;
-    }
-    
-    .file-info .file-meta {
-        color: var(--text-secondary);
-        font-size: 0.85rem;
-        line-height: 1.4;
-    }
-    
-    .file-info .file-meta span {
-        display: inline-block;
-        margin-right: 0.75rem;
-        padding: 0.2rem 0.6rem;
-        background: rgba(99, 102, 241, 0.1);
-        border-radius: 6px;
-        font-weight: 500;
-        font-size: 0.8rem;
-    }
-    
-
-    
     /* Summary box */
     .summary-box {
         background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
@@ -197,17 +145,482 @@ st.markdown("""
     
 
 </style>
-""", unsafe_allow_html=True)
+"""
 
-def main():
-    # Check Gemini configuration and show instructions if missing when running in Streamlit
-    from backend import GEMINI_CONFIGURED
-    if not GEMINI_CONFIGURED:
-        st.warning(
-            "Google Gemini API key not configured.\n\n"
-            "To deploy on Streamlit, add your key to `.streamlit/secrets.toml` like:\n"
-            "`GEMINI_API_KEY = \"your_api_key_here\"` or set the same in environment variables."
+st.markdown(_css(), unsafe_allow_html=True)
+
+@st.cache_resource
+def _supported_formats():
+    """Supported formats, built once per process instead of on every rerun."""
+    return get_supported_formats()
+
+_FILE_TYPES = list(_supported_formats().keys())
+
+# Summary style labels shown in the UI mapped to backend style ids
+_STYLE_MAPPING = {
+    "Bullet Points": "bullet",
+    "Abstract": "abstract",
+    "Detailed": "detailed"
+}
+
+# Icons shown on the file info card per file type
+_FILE_ICONS = {
+    "pdf": "📄",
+    "docx": "📝",
+    "txt": "📜",
+    "html": "🌐",
+    "markdown": "📝"
+}
+
+def _content_key(buffer) -> str:
+    """Hash an upload's buffer for cache keys without copying the memoryview."""
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(buffer)
+    if blake3 is not None:
+        return blake3.blake3(buffer).hexdigest()
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+# The underscore-prefixed buffer argument is excluded from Streamlit's own
+# hashing; the content key computed by _content_key identifies the file instead.
+@st.cache_data(show_spinner=False, max_entries=500, persist="disk")
+def _extract_cached(content_key: str, ext: str, _file_buffer) -> str:
+    """Extract text from an uploaded buffer, cached on its content key across reruns."""
+    from utils.file_reader import extract_text_from_bytes
+    return extract_text_from_bytes(bytes(_file_buffer), ext)
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _file_info_cached(content_key: str, file_name: str, _file_buffer):
+    """Get file information for an uploaded buffer, cached on its content key across reruns."""
+    from utils.file_reader import get_file_info_from_bytes
+    return get_file_info_from_bytes(bytes(_file_buffer), file_name)
+
+def _generate_summary(text: str, style: str, use_cache: bool = True) -> str:
+    """Summarize text; the backend uses map-reduce over chunks for very large documents."""
+    from backend import summarize_text
+    return summarize_text(text, style, use_cache)
+
+class _CacheMiss(Exception):
+    """Raised by _summarize_cached when only looking up a summary that is not cached."""
+
+class _BatchFailed(Exception):
+    """Raised by _summarize_batch_cached so batches with failed documents are not cached."""
+    
+    def __init__(self, summaries: list):
+        super().__init__("Some documents failed to summarize")
+        self.summaries = summaries
+
+def _is_error(summary: str) -> bool:
+    """Whether a backend summary is an error message rather than a summary."""
+    return summary.startswith("Error") or "Error generating summary:" in summary
+
+# Summaries persist to disk so restarts don't re-spend tokens; max_entries bounds eviction
+@st.cache_data(max_entries=500, show_spinner=False, persist="disk")
+def _summarize_cached(text: str, style: str, _summary=None, _use_cache: bool = True) -> str:
+    """
+    Generate a summary, cached on (text, style) so repeats skip the Gemini call.
+    
+    ``_summary`` and ``_use_cache`` are excluded from the cache key: pass an
+    already generated summary to store it, or ``_CacheMiss`` to only look one
+    up; pass ``_use_cache=False`` to bypass the backend's response caches too.
+    """
+    if _summary is _CacheMiss:
+        raise _CacheMiss()
+    summary = _generate_summary(text, style, _use_cache) if _summary is None else _summary
+    # Raise instead of returning so failed generations are never cached
+    if _is_error(summary):
+        raise RuntimeError(summary)
+    return summary
+
+def _stream_summary(text: str, style: str, force_regenerate: bool = False) -> str:
+    """Return a cached summary, or stream a new one onto the page and cache it."""
+    from backend import LARGE_TEXT_THRESHOLD, summarize_text_stream
+    if force_regenerate:
+        _summarize_cached.clear(text, style)
+    try:
+        return _summarize_cached(text, style, _summary=_CacheMiss)
+    except _CacheMiss:
+        pass
+    if len(text) > LARGE_TEXT_THRESHOLD:
+        # Large documents are summarized in parallel chunks rather than streamed
+        return _summarize_cached(text, style, _use_cache=not force_regenerate)
+    placeholder = st.empty()
+    summary = placeholder.write_stream(summarize_text_stream(text, style, use_cache=not force_regenerate))
+    # The finished summary is rendered in the output column
+    placeholder.empty()
+    return _summarize_cached(text, style, _summary=summary)
+
+@st.cache_data(ttl=24 * 3600, max_entries=128, show_spinner=False)
+def _evaluate_cached(original_text: str, summary: str) -> dict:
+    """Evaluate summary quality, cached on (original_text, summary)."""
+    from backend import evaluate_summary_quality
+    return evaluate_summary_quality(original_text, summary)
+
+def _extract_upload(upload) -> str:
+    """Extract text from one (file_name, content_key, buffer) upload (safe to run in a worker thread)."""
+    file_name, content_key, file_buffer = upload
+    return _extract_cached(content_key, os.path.splitext(file_name)[1], file_buffer)
+
+# Above this combined size documents are summarized one request each instead of batched
+_BATCH_MAX_CHARS = 100_000
+
+@st.cache_data(max_entries=500, show_spinner=False, persist="disk")
+def _summarize_batch_cached(texts: tuple, style: str, _use_cache: bool = True) -> list:
+    """Summarize several documents in one Gemini request, cached on (texts, style)."""
+    from backend import summarize_batch
+    summaries = summarize_batch(list(texts), style, use_cache=_use_cache)
+    # Raise instead of returning so transient failures (e.g. rate limits) are never cached
+    if any(_is_error(summary) for summary in summaries):
+        raise _BatchFailed(summaries)
+    return summaries
+
+def _summarize_documents(documents, summary_style: str, style: str, force_regenerate: bool = False):
+    """Summarize several documents, batched into one request when they fit."""
+    texts = tuple(text for _, text in documents)
+    if force_regenerate:
+        _summarize_batch_cached.clear(texts, style)
+        for text in texts:
+            _summarize_cached.clear(text, style)
+    
+    if sum(len(text) for text in texts) <= _BATCH_MAX_CHARS:
+        with st.spinner("🤖 AI is analyzing your documents..."):
+            try:
+                summaries = _summarize_batch_cached(texts, style, _use_cache=not force_regenerate)
+            except _BatchFailed as e:
+                summaries = e.summaries
+        results = [
+            {'file_name': file_name, 'summary': summary}
+            for (file_name, _), summary in zip(documents, summaries)
+        ]
+    else:
+        results = [None] * len(documents)
+        with st.status("🤖 AI is analyzing your documents...", expanded=True) as status:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    executor.submit(_summarize_cached, text, style, _use_cache=not force_regenerate): index
+                    for index, (_, text) in enumerate(documents)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    file_name = documents[index][0]
+                    try:
+                        results[index] = {'file_name': file_name, 'summary': future.result()}
+                        status.write(f"✅ {file_name}")
+                    except Exception as e:
+                        results[index] = {'file_name': file_name, 'summary': f"Error: {str(e)}"}
+                        status.write(f"❌ {file_name}: {str(e)}")
+            status.update(label="✅ Summaries generated!", state="complete")
+    
+    # Store summaries in session state for display and download
+    st.session_state.pop('current_summary', None)
+    st.session_state.pop('quality_metrics', None)
+    st.session_state['document_summaries'] = results
+    st.session_state['summary_style'] = summary_style
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    st.session_state['timestamp'] = timestamp
+    st.session_state['download_filename'] = f"summaries_{summary_style.replace(' ', '_').lower()}_{timestamp}.txt"
+
+@st.fragment
+def _input_panel(input_method: str, summary_style: str, force_regenerate: bool):
+    """Input column; runs as a fragment so its widgets only rerun this panel."""
+    # Initialize input variables
+    input_text = ""
+    input_key = None  # file_id of a single uploaded document
+    documents = []
+    
+    st.header("📥 Input Document")
+    
+    if input_method == "📁 Upload Document":
+        # Create a compact upload area
+        st.markdown("""
+            <div style="
+                border: 2px dashed #6366f1;
+                border-radius: 12px;
+                background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%);
+                padding: 1.5rem;
+                text-align: center;
+                margin: 1rem 0;
+                transition: all 0.3s ease;
+            ">
+                <div style="font-size: 2rem; margin-bottom: 0.5rem;">📁</div>
+                <div style="font-size: 1rem; font-weight: 600; color: #1f2937; margin-bottom: 0.25rem;">
+                    Drop your document here
+                </div>
+                <div style="color: #6b7280; font-size: 0.85rem;">
+                    PDF, DOCX, TXT, HTML, Markdown
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        uploaded_files = st.file_uploader(
+            "Choose a document file",
+            type=_FILE_TYPES,
+            accept_multiple_files=True,
+            help=f"Upload one or more documents to extract and summarize. Supported formats: {', '.join(_FILE_TYPES).upper()}",
+            label_visibility="collapsed"  # Hide the default label
         )
+        
+        if uploaded_files:
+            # Check file sizes (limit to 50MB each) without materializing the bytes
+            for uploaded_file in uploaded_files:
+                file_size_mb = uploaded_file.size / (1024 * 1024)
+                if file_size_mb > 50:
+                    st.error(f"❌ File too large! Maximum size is 50MB. {uploaded_file.name} is {file_size_mb:.1f}MB")
+                    return
+            
+            # Memoize file info and text per upload on its file_id, so reruns
+            # compare a short id instead of re-hashing the uploaded bytes
+            previous_uploads = st.session_state.get('_uploads', {})
+            upload_memo = {
+                f.file_id: previous_uploads[f.file_id]
+                for f in uploaded_files if f.file_id in previous_uploads
+            }
+            new_files = [f for f in uploaded_files if f.file_id not in upload_memo]
+            
+            if new_files:
+                # Zero-copy views over each new upload's bytes, hashed once
+                uploads = []
+                for f in new_files:
+                    file_buffer = f.getbuffer()
+                    uploads.append((f.name, _content_key(file_buffer), file_buffer))
+                
+                # Extract text from all new files concurrently with loading state
+                try:
+                    with st.spinner("🔍 Extracting text from your document..."):
+                        with ThreadPoolExecutor(max_workers=4) as executor:
+                            extracted_texts = list(executor.map(_extract_upload, uploads))
+                except Exception as e:
+                    st.error(f"❌ An error occurred while processing the file: {str(e)}")
+                    return
+                
+                for f, (file_name, content_key, file_buffer), extracted_text in zip(new_files, uploads, extracted_texts):
+                    upload_memo[f.file_id] = {
+                        'file_info': _file_info_cached(content_key, file_name, file_buffer),
+                        'text': extracted_text
+                    }
+            st.session_state['_uploads'] = upload_memo
+            
+            for uploaded_file in uploaded_files:
+                # Display file info with custom styling
+                file_info = upload_memo[uploaded_file.file_id]['file_info']
+                if not file_info:
+                    st.error("❌ Failed to read file information. Please try with a different file.")
+                    return
+                
+                # Check if file type is supported
+                if not file_info.get('supported', False):
+                    st.error(f"❌ File type '{file_info.get('file_type', 'unknown')}' is not supported. Please use PDF, DOCX, TXT, HTML, or Markdown files.")
+                    return
+                
+                # Get appropriate file icon
+                file_icon = _FILE_ICONS.get(file_info['file_type'], "📄")
+                
+                # Precompute the metadata fields once
+                file_size_mb = file_info['file_size_mb']
+                meta = [
+                    file_info['file_type'].upper(),
+                    f"{file_size_mb} MB" if file_size_mb >= 0.01 else "< 0.01 MB"
+                ]
+                page_count = file_info.get('page_count')
+                if page_count:
+                    meta.append(f"{page_count} pages")
+                extractor = file_info.get('extractor')
+                if extractor:
+                    meta.append(extractor)
+                
+                # Create file display
+                with st.container(border=True):
+                    st.markdown(f"{file_icon} **{file_info['file_name']}**")
+                    st.caption(" · ".join(meta))
+            
+            documents = [(f.name, upload_memo[f.file_id]['text']) for f in uploaded_files]
+            
+            for file_name, extracted_text in documents:
+                if extracted_text.startswith("Error") or extracted_text.startswith("Warning"):
+                    st.markdown(f'''
+                        <div class="error-box">
+                            <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem;">
+                                <span style="font-size: 1.5rem;">⚠️</span>
+                                <span style="font-weight: 600; font-size: 1.1rem;">Document Processing Error</span>
+                            </div>
+                            <div style="color: #dc2626; font-size: 0.95rem;">{file_name}: {extracted_text}</div>
+                        </div>
+                    ''', unsafe_allow_html=True)
+                    return
+            
+            # Show success message with animation
+            st.markdown(f'''
+                <div class="success-box">
+                    <div style="display: flex; align-items: center; gap: 0.5rem;">
+                        <span style="font-size: 1.5rem;">✅</span>
+                        <span style="font-weight: 600; color: #065f46;">
+                            Successfully extracted text from {', '.join(file_name for file_name, _ in documents)}
+                        </span>
+                    </div>
+                    <div style="margin-top: 0.5rem; color: #047857; font-size: 0.9rem;">
+                        Ready to generate summary! Choose your preferred style and click "Generate Summary"
+                    </div>
+                </div>
+            ''', unsafe_allow_html=True)
+            
+            # Document preview removed for cleaner UI
+            
+            if len(documents) == 1:
+                input_text = documents[0][1]
+                input_key = uploaded_files[0].file_id
+            
+    else:  # Paste Text
+        input_text = st.text_area(
+            "Paste your text here:",
+            height=300,
+            placeholder="Enter or paste the text you want to summarize...",
+            help="Paste any text content you want to summarize"
+        )
+    
+    # Confirm a summary generated just before the last full rerun
+    if st.session_state.pop('_summary_notice', False):
+        st.success("✅ Summary generated successfully!")
+    
+    # Summarize button
+    if len(documents) > 1:
+        if st.button("🚀 Summarize All", type="primary", use_container_width=True):
+            _summarize_documents(documents, summary_style, _STYLE_MAPPING[summary_style], force_regenerate)
+            # Rerun the whole app so the output panel picks up the new summaries
+            st.rerun()
+    elif input_text and input_text.strip():
+        if st.button("🚀 Generate Summary", type="primary", use_container_width=True):
+            summary_key = (input_key, _STYLE_MAPPING[summary_style]) if input_key else None
+            if (
+                summary_key is not None
+                and not force_regenerate
+                and st.session_state.get('_summary_for') == summary_key
+                and 'current_summary' in st.session_state
+            ):
+                # Same upload and style as the summary already shown
+                st.success("✅ Summary generated successfully!")
+            else:
+                with st.spinner("🤖 AI is analyzing your document..."):
+                    try:
+                        # Stream the summary as it is generated (cached on text and style)
+                        summary = _stream_summary(input_text, _STYLE_MAPPING[summary_style], force_regenerate)
+                        
+                        # Store summary in session state for download
+                        st.session_state.pop('document_summaries', None)
+                        st.session_state['current_summary'] = summary
+                        st.session_state['summary_style'] = summary_style
+                        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                        st.session_state['timestamp'] = timestamp
+                        st.session_state['download_filename'] = f"summary_{summary_style.replace(' ', '_').lower()}_{timestamp}.txt"
+                        st.session_state['_summary_for'] = summary_key
+                        
+                        # Evaluate summary quality
+                        quality_metrics = _evaluate_cached(input_text, summary)
+                        st.session_state['quality_metrics'] = quality_metrics
+                    except RuntimeError as e:
+                        st.markdown(f'<div class="error-box">{str(e)}</div>', unsafe_allow_html=True)
+                    except Exception as e:
+                        st.error(f"❌ An error occurred: {str(e)}")
+                    else:
+                        # Rerun the whole app so the output panel picks up the new summary
+                        st.session_state['_summary_notice'] = True
+                        st.rerun()
+    elif input_method == "✏️ Paste Text":
+        st.info("ℹ️ Please paste some text to summarize.")
+
+@st.fragment
+def _output_panel():
+    """Output column; reads the generated summary from session state."""
+    st.header("📋 Generated Summary")
+    
+    if 'document_summaries' in st.session_state:
+        st.markdown(f"**Style:** {st.session_state['summary_style']}  \n**Generated:** {st.session_state['timestamp']}")
+        for result in st.session_state['document_summaries']:
+            with st.expander(f"📄 {result['file_name']}", expanded=True):
+                st.markdown(result['summary'])
+        
+        # Download all summaries as one file
+        st.markdown("---")
+        st.markdown("### 💾 Download Summaries")
+        combined = "\n\n".join(
+            f"=== {result['file_name']} ===\n{result['summary']}"
+            for result in st.session_state['document_summaries']
+        )
+        st.download_button(
+            label="📥 Download as TXT",
+            data=combined,
+            file_name=st.session_state['download_filename'],
+            mime="text/plain",
+            use_container_width=True
+        )
+    elif 'current_summary' in st.session_state:
+        # Display summary
+        st.markdown(f'''
+            <div class="summary-box">
+                <div style="margin-bottom: 1rem;">
+                    <strong>Style:</strong> {st.session_state['summary_style']}<br>
+                    <strong>Generated:</strong> {st.session_state['timestamp']}
+                </div>
+                <hr style="border: 1px solid #e0f2fe; margin: 1rem 0;">
+                <div style="line-height: 1.6; color: #1f2937;">
+                    {st.session_state['current_summary']}
+                </div>
+            </div>
+        ''', unsafe_allow_html=True)
+        
+        # Display quality metrics if available
+        if 'quality_metrics' in st.session_state:
+            metrics = st.session_state['quality_metrics']
+            if 'error' not in metrics:
+                st.markdown("---")
+                st.markdown("### 📊 Summary Quality Analysis")
+                
+                # Native components diff better than a rebuilt HTML blob
+                quality = st.container(border=True)
+                quality.metric(
+                    "Quality",
+                    f"{metrics['quality_score']}/100",
+                    metrics['overall_rating'],
+                    delta_color="off"
+                )
+                quality.progress(metrics['quality_score'] / 100)
+                
+                compression_col, length_col = quality.columns(2)
+                compression_col.markdown(f"**Compression:** {metrics['compression_ratio']}%")
+                compression_col.caption(f"({metrics['summary_length']} of {metrics['original_length']} words)")
+                length_col.markdown(f"**Length:** {metrics['summary_length']} words")
+                length_col.caption("Appropriate range: 50-200 words")
+                
+                quality.markdown("**Quality Indicators:**")
+                quality.markdown("\n".join(f"- {item}" for item in metrics['feedback']))
+                
+                if metrics['suggestions']:
+                    quality.markdown("**💡 Suggestions:**")
+                    quality.markdown("\n".join(f"- {item}" for item in metrics['suggestions']))
+        
+        # Download button
+        st.markdown("---")
+        st.markdown("### 💾 Download Summary")
+        
+        # Download button
+        st.download_button(
+            label="📥 Download as TXT",
+            data=st.session_state['current_summary'],
+            file_name=st.session_state['download_filename'],
+            mime="text/plain",
+            use_container_width=True
+        )
+        
+        # Copy to clipboard button
+        if st.button("📋 Copy to Clipboard", use_container_width=True):
+            st.write("📋 Summary copied to clipboard!")
+            st.code(st.session_state['current_summary'])
+    else:
+        st.info("ℹ️ Upload a document or paste text, then click 'Generate Summary' to see results here.")
+
+def main():
+    # Reserve space for the configuration warning; it is filled in after the page
+    # has rendered so importing backend doesn't delay the first paint
+    config_notice = st.empty()
+    
     # Header with modern design
     st.markdown('<h1 class="main-header">🚀 AI Document Summarizer</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Transform any document into intelligent summaries with cutting-edge AI</p>', unsafe_allow_html=True)
@@ -225,21 +638,18 @@ def main():
         st.markdown("### 🎯 Summary Style")
         summary_style = st.selectbox(
             "Select summary format:",
-            ["Bullet Points", "Abstract", "Detailed"],
+            list(_STYLE_MAPPING),
             help="Bullet Points: Key points in bullet format\nAbstract: 3-4 line summary\nDetailed: Comprehensive narrative summary"
         )
         
-        # Style mapping
-        style_mapping = {
-            "Bullet Points": "bullet",
-            "Abstract": "abstract", 
-            "Detailed": "detailed"
-        }
+        force_regenerate = st.checkbox(
+            "🔄 Force regenerate",
+            help="Ignore previously cached summaries for this document and call Gemini again"
+        )
         
         st.markdown("---")
         st.markdown("### 📁 Supported Formats")
-        supported_formats = get_supported_formats()
-        for ext, desc in supported_formats.items():
+        for ext, desc in _supported_formats().items():
             st.markdown(f"**{ext.upper()}** - {desc}")
         
         st.markdown("---")
@@ -258,277 +668,11 @@ def main():
     # Main content area
     col1, col2 = st.columns([1, 1])
     
-    # Initialize input_text variable
-    input_text = ""
-    
     with col1:
-        st.header("📥 Input Document")
-        
-        if input_method == "📁 Upload Document":
-            # Get supported file types
-            supported_formats = get_supported_formats()
-            file_types = list(supported_formats.keys())
-            
-            # Create a compact upload area
-            st.markdown("""
-                <div style="
-                    border: 2px dashed #6366f1;
-                    border-radius: 12px;
-                    background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%);
-                    padding: 1.5rem;
-                    text-align: center;
-                    margin: 1rem 0;
-                    transition: all 0.3s ease;
-                ">
-                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">📁</div>
-                    <div style="font-size: 1rem; font-weight: 600; color: #1f2937; margin-bottom: 0.25rem;">
-                        Drop your document here
-                    </div>
-                    <div style="color: #6b7280; font-size: 0.85rem;">
-                        PDF, DOCX, TXT, HTML, Markdown
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            uploaded_file = st.file_uploader(
-                "Choose a document file",
-                type=file_types,
-                help=f"Upload a document to extract and summarize. Supported formats: {', '.join(file_types).upper()}",
-                label_visibility="collapsed"  # Hide the default label
-            )
-            
-            if uploaded_file is not None:
-                # Check file size (limit to 50MB)
-                file_size_bytes = len(uploaded_file.getvalue())
-                file_size_mb = file_size_bytes / (1024 * 1024)
-                if file_size_mb > 50:
-                    st.error(f"❌ File too large! Maximum size is 50MB. Your file is {file_size_mb:.1f}MB")
-                    return
-                # Display file info with custom styling
-                # Create a temporary file first to get proper file info
-                file_ext = os.path.splitext(uploaded_file.name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_path = tmp_file.name
-                
-                # Get file info from the temporary file
-                file_info = get_file_info(tmp_path)
-                if not file_info:
-                    st.error("❌ Failed to read file information. Please try with a different file.")
-                    os.unlink(tmp_path)
-                    return
-                
-                # Check if file type is supported
-                if not file_info.get('supported', False):
-                    st.error(f"❌ File type '{file_info.get('file_type', 'unknown')}' is not supported. Please use PDF, DOCX, TXT, HTML, or Markdown files.")
-                    os.unlink(tmp_path)
-                    return
-                
-                # Get appropriate file icon
-                file_icon = "📄"  # Default
-                if file_info['file_type'] == 'pdf':
-                    file_icon = "📄"
-                elif file_info['file_type'] == 'docx':
-                    file_icon = "📝"
-                elif file_info['file_type'] == 'txt':
-                    file_icon = "📜"
-                elif file_info['file_type'] == 'html':
-                    file_icon = "🌐"
-                elif file_info['file_type'] == 'markdown':
-                    file_icon = "📝"
-                
-                # Create beautiful file display
-                st.markdown(f'''
-                    <div class="file-info">
-                        <div class="file-icon">{file_icon}</div>
-                        <div class="file-details">
-                            <span class="file-name">{file_info['file_name']}</span>
-                                                            <div class="file-meta">
-                                    <span>{file_info['file_type'].upper()}</span>
-                                    <span>{file_info['file_size_mb'] if file_info['file_size_mb'] >= 0.01 else '< 0.01'} MB</span>
-                                    {f'<span>{file_info["page_count"]} pages</span>' if 'page_count' in file_info and file_info["page_count"] else ''}
-                                    {f'<span>{file_info["extractor"]}</span>' if 'extractor' in file_info and file_info["extractor"] else ''}
-                                </div>
-                        </div>
-                    </div>
-                ''', unsafe_allow_html=True)
-                
-
-                
-                # Extract text from file with loading state
-                try:
-                    with st.spinner("🔍 Extracting text from your document..."):
-                        extracted_text = extract_text_from_file(tmp_path)
-                    
-                    # Clean up temporary file
-                    os.unlink(tmp_path)
-                    
-                    if extracted_text.startswith("Error") or extracted_text.startswith("Warning"):
-                        st.markdown(f'''
-                            <div class="error-box">
-                                <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem;">
-                                    <span style="font-size: 1.5rem;">⚠️</span>
-                                    <span style="font-weight: 600; font-size: 1.1rem;">Document Processing Error</span>
-                                </div>
-                                <div style="color: #dc2626; font-size: 0.95rem;">{extracted_text}</div>
-                            </div>
-                        ''', unsafe_allow_html=True)
-                        return
-                except Exception as e:
-                    # Clean up temporary file on error
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                    st.error(f"❌ An error occurred while processing the file: {str(e)}")
-                    return
-                
-                # Show success message with animation
-                st.markdown(f'''
-                    <div class="success-box">
-                        <div style="display: flex; align-items: center; gap: 0.5rem;">
-                            <span style="font-size: 1.5rem;">✅</span>
-                            <span style="font-weight: 600; color: #065f46;">
-                                Successfully extracted text from {file_info['file_name']}
-                            </span>
-                        </div>
-                        <div style="margin-top: 0.5rem; color: #047857; font-size: 0.9rem;">
-                            Ready to generate summary! Choose your preferred style and click "Generate Summary"
-                        </div>
-                    </div>
-                ''', unsafe_allow_html=True)
-                
-                # Document preview removed for cleaner UI
-                
-                input_text = extracted_text
-                
-        else:  # Paste Text
-            input_text = st.text_area(
-                "Paste your text here:",
-                height=300,
-                placeholder="Enter or paste the text you want to summarize...",
-                help="Paste any text content you want to summarize"
-            )
-        
-        # Summarize button
-        if input_text and input_text.strip():
-            if st.button("🚀 Generate Summary", type="primary", use_container_width=True):
-                with st.spinner("🤖 AI is analyzing your document..."):
-                    try:
-                        # Generate summary
-                        summary = summarize_text(input_text, style_mapping[summary_style])
-                        
-                        if summary.startswith("Error"):
-                            st.markdown(f'<div class="error-box">{summary}</div>', unsafe_allow_html=True)
-                        else:
-                            # Store summary in session state for download
-                            st.session_state['current_summary'] = summary
-                            st.session_state['summary_style'] = summary_style
-                            st.session_state['timestamp'] = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                            
-                            # Evaluate summary quality
-                            quality_metrics = evaluate_summary_quality(input_text, summary)
-                            st.session_state['quality_metrics'] = quality_metrics
-                            
-                            st.success("✅ Summary generated successfully!")
-                    except Exception as e:
-                        st.error(f"❌ An error occurred: {str(e)}")
-        elif input_method == "✏️ Paste Text":
-            st.info("ℹ️ Please paste some text to summarize.")
+        _input_panel(input_method, summary_style, force_regenerate)
     
     with col2:
-        st.header("📋 Generated Summary")
-        
-        if 'current_summary' in st.session_state:
-            # Display summary
-            st.markdown(f'''
-                <div class="summary-box">
-                    <div style="margin-bottom: 1rem;">
-                        <strong>Style:</strong> {st.session_state['summary_style']}<br>
-                        <strong>Generated:</strong> {st.session_state['timestamp']}
-                    </div>
-                    <hr style="border: 1px solid #e0f2fe; margin: 1rem 0;">
-                    <div style="line-height: 1.6; color: #1f2937;">
-                        {st.session_state['current_summary']}
-                    </div>
-                </div>
-            ''', unsafe_allow_html=True)
-            
-            # Display quality metrics if available
-            if 'quality_metrics' in st.session_state:
-                metrics = st.session_state['quality_metrics']
-                if 'error' not in metrics:
-                    st.markdown("---")
-                    st.markdown("### 📊 Summary Quality Analysis")
-                    
-                    # Quality score with color coding
-                    score_color = "#10b981" if metrics['quality_score'] >= 80 else "#f59e0b" if metrics['quality_score'] >= 60 else "#ef4444"
-                    st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%);
-                            border: 2px solid {score_color};
-                            border-radius: 15px;
-                            padding: 1.5rem;
-                            margin: 1rem 0;
-                        ">
-                            <div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 1rem;">
-                                <div style="
-                                    background: {score_color};
-                                    color: white;
-                                    padding: 0.5rem 1rem;
-                                    border-radius: 10px;
-                                    font-weight: 600;
-                                    font-size: 1.2rem;
-                                ">
-                                    {metrics['quality_score']}/100
-                                </div>
-                                <div style="font-weight: 600; font-size: 1.1rem; color: {score_color};">
-                                    {metrics['overall_rating']}
-                                </div>
-                            </div>
-                            
-                            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
-                                <div>
-                                    <strong>Compression:</strong> {metrics['compression_ratio']}%<br>
-                                    <small style="color: #6b7280;">({metrics['summary_length']} of {metrics['original_length']} words)</small>
-                                </div>
-                                <div>
-                                    <strong>Length:</strong> {metrics['summary_length']} words<br>
-                                    <small style="color: #6b7280;">Appropriate range: 50-200 words</small>
-                                </div>
-                            </div>
-                            
-                            <div style="margin-bottom: 1rem;">
-                                <strong>Quality Indicators:</strong>
-                                <ul style="margin: 0.5rem 0; padding-left: 1.5rem;">
-                                    {''.join([f'<li>{item}</li>' for item in metrics['feedback']])}
-                                </ul>
-                            </div>
-                            
-                            {f'<div style="margin-top: 1rem;"><strong>💡 Suggestions:</strong><ul style="margin: 0.5rem 0; padding-left: 1.5rem;">{''.join([f"<li>{item}</li>" for item in metrics['suggestions']])}</ul></div>' if metrics['suggestions'] else ''}
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            # Download button
-            st.markdown("---")
-            st.markdown("### 💾 Download Summary")
-            
-            # Create download filename
-            filename = f"summary_{st.session_state['summary_style'].replace(' ', '_').lower()}_{st.session_state['timestamp']}.txt"
-            
-            # Download button
-            st.download_button(
-                label="📥 Download as TXT",
-                data=st.session_state['current_summary'],
-                file_name=filename,
-                mime="text/plain",
-                use_container_width=True
-            )
-            
-            # Copy to clipboard button
-            if st.button("📋 Copy to Clipboard", use_container_width=True):
-                st.write("📋 Summary copied to clipboard!")
-                st.code(st.session_state['current_summary'])
-        else:
-            st.info("ℹ️ Upload a document or paste text, then click 'Generate Summary' to see results here.")
+        _output_panel()
     
     # Footer
     st.markdown("---")
@@ -538,6 +682,15 @@ def main():
         "</div>",
         unsafe_allow_html=True
     )
+    
+    # Check Gemini configuration and show instructions if missing when running in Streamlit
+    from backend import GEMINI_CONFIGURED
+    if not GEMINI_CONFIGURED:
+        config_notice.warning(
+            "Google Gemini API key not configured.\n\n"
+            "To deploy on Streamlit, add your key to `.streamlit/secrets.toml` like:\n"
+            "`GEMINI_API_KEY = \"your_api_key_here\"` or set the same in environment variables."
+        )
 
 if __name__ == "__main__":
     main()
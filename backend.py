@@ -1,6 +1,12 @@
+import asyncio
+import contextlib
+import io
+import json
 import os
-from typing import Literal
+from typing import Iterator, Literal, Optional
 import re
+import threading
+import time
 
 # Optional import of streamlit to read secrets when running on Streamlit
 try:
@@ -10,6 +16,9 @@ except Exception:
 
 import google.generativeai as genai
 
+from utils import llm_cache, semantic_cache
+from utils.key_pool import KeyPool, is_rate_limit_error
+
 # Optional dotenv support: don't crash if python-dotenv isn't installed
 try:
     from dotenv import load_dotenv
@@ -23,14 +32,25 @@ except Exception:
 # Load environment variables from .env when present (no-op if package missing)
 load_dotenv()
 
-# Try environment first, then Streamlit secrets (if available)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY and st is not None:
-    # st.secrets acts like a dict. Support common key names.
-    try:
-        GEMINI_API_KEY = st.secrets.get("GEMINI_API_KEY") or st.secrets.get("gemini_api_key")
-    except Exception:
-        GEMINI_API_KEY = GEMINI_API_KEY
+def _resolve_api_key():
+    """Find the Gemini API key: environment first, then Streamlit secrets (if available)."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key and st is not None and hasattr(st, "secrets"):
+        # st.secrets acts like a dict. Support common key names.
+        try:
+            api_key = st.secrets.get("GEMINI_API_KEY") or st.secrets.get("gemini_api_key")
+        except Exception:
+            # No secrets file configured
+            pass
+    return api_key
+
+# Resolved once at import; nothing reads the environment per call
+GEMINI_API_KEY = _resolve_api_key()
+
+# Optional pool of keys (GEMINI_API_KEYS="key1,key2,...") to rotate on rate limits
+KEY_POOL = KeyPool.from_env(GEMINI_API_KEY)
+if not GEMINI_API_KEY:
+    GEMINI_API_KEY = KEY_POOL.acquire()
 
 # Configure genai only if key is available. Don't raise on import to allow the app to
 # start and surface a user-friendly message in the UI when the key is missing.
@@ -40,6 +60,163 @@ if GEMINI_API_KEY:
 else:
     GEMINI_CONFIGURED = False
 
+# Attempts per generation, switching to the next pooled key after a rate limit
+MAX_KEY_ATTEMPTS = 3
+
+# Gemini 1.5 Flash for better performance
+MODEL_NAME = 'gemini-1.5-flash'
+
+_model = None
+_model_lock = threading.Lock()
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the long-lived event loop (on a daemon thread) that sync callers
+    use to run async summarization.
+    
+    The shared model's async client stays bound to the loop it first ran on,
+    so every sync call reuses this loop instead of asyncio.run's fresh one.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                _loop = loop
+    return _loop
+
+def get_model():
+    """
+    Return the shared GenerativeModel.
+    
+    The model is created once per process so the client it builds on first use
+    (and that client's persistent, keep-alive connection to Gemini) is reused
+    across requests instead of being set up again for every call.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
+
+_active_key = GEMINI_API_KEY
+
+def _rotate_key(failed_key: str) -> bool:
+    """
+    Put a rate-limited key on cooldown and reconfigure genai with the next one.
+    
+    The SDK configuration is process-wide, so the pool switches the active key
+    rather than interleaving keys per call.
+    
+    Returns:
+        bool: True if a different key is now active
+    """
+    global _active_key, _model
+    KEY_POOL.penalize(failed_key)
+    with _model_lock:
+        if _active_key != failed_key:
+            # Another request already rotated away from this key
+            return True
+        next_key = KEY_POOL.acquire()
+        if not next_key or next_key == failed_key:
+            return False
+        genai.configure(api_key=next_key)
+        _active_key = next_key
+        # Rebuild the model so it picks up a client for the new key
+        _model = None
+    return True
+
+def generate_content(prompt: str, generation_config=None, stream: bool = False):
+    """Call Gemini with the shared model, rotating pooled keys on rate limits."""
+    for attempt in range(MAX_KEY_ATTEMPTS):
+        key = _active_key
+        try:
+            return get_model().generate_content(
+                prompt,
+                safety_settings=SAFETY_SETTINGS,
+                generation_config=generation_config or build_generation_config(),
+                stream=stream
+            )
+        except Exception as e:
+            if attempt + 1 < MAX_KEY_ATTEMPTS and is_rate_limit_error(e) and _rotate_key(key):
+                continue
+            raise
+
+async def generate_content_async(prompt: str, generation_config=None):
+    """Async counterpart of generate_content."""
+    for attempt in range(MAX_KEY_ATTEMPTS):
+        key = _active_key
+        model = get_model()
+        try:
+            if hasattr(model, "generate_content_async"):
+                return await model.generate_content_async(
+                    prompt,
+                    safety_settings=SAFETY_SETTINGS,
+                    generation_config=generation_config or build_generation_config()
+                )
+            # Older SDKs without async support: run the sync call in a thread
+            return await asyncio.to_thread(
+                model.generate_content,
+                prompt,
+                safety_settings=SAFETY_SETTINGS,
+                generation_config=generation_config or build_generation_config()
+            )
+        except Exception as e:
+            if attempt + 1 < MAX_KEY_ATTEMPTS and is_rate_limit_error(e) and _rotate_key(key):
+                continue
+            raise
+
+# Bump whenever build_prompt changes so cached summaries are not reused
+PROMPT_VERSION = "v2"
+
+# Safety settings shared by all generation calls
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
+
+def build_generation_config(max_output_tokens: int = 2048):
+    """Build the generation config shared by all summarization calls."""
+    return genai.types.GenerationConfig(
+        temperature=0.3,  # Lower temperature for more consistent results
+        top_p=0.8,
+        top_k=40,
+        max_output_tokens=max_output_tokens,
+    )
+
+# Output token caps per style; an abstract needs a few hundred tokens at most
+STYLE_MAX_OUTPUT_TOKENS = {
+    "abstract": 256,
+    "bullet": 768,
+    "detailed": 2048,
+}
+
+def style_generation_config(style: str):
+    """Build the generation config for one summary style."""
+    return build_generation_config(STYLE_MAX_OUTPUT_TOKENS.get(style, 2048))
+
+def supports_thinking(model_name: str) -> bool:
+    """Whether a model spends "thinking" tokens (Gemini 2.5 and later)."""
+    match = re.search(r'gemini-(\d+(?:\.\d+)?)', model_name)
+    return bool(match) and float(match.group(1)) >= 2.5
+
+# Patterns used by preprocess_text, compiled once
+_RE_WS = re.compile(r'\s+')
+_RE_NOISE = re.compile(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]')
+_RE_PIPE = re.compile(r'(\w)\|(\w)')
+_RE_ZERO = re.compile(r'(\w)0(\w)')
+_RE_PAGE = re.compile(r'Page \d+')
+_RE_LINENUM = re.compile(r'^\d+\s*', re.MULTILINE)
+_RE_BULLET = re.compile(r'^\s*[•\-\*]\s*', re.MULTILINE)
+_RE_SENT = re.compile(r'([.!?])\s*([A-Z])')
+
 def preprocess_text(text: str) -> str:
     """
     Preprocess text to improve summarization quality.
@@ -53,35 +230,87 @@ def preprocess_text(text: str) -> str:
     if not text or not text.strip():
         return ""
     
-    # Remove excessive whitespace and normalize
-    text = re.sub(r'\s+', ' ', text.strip())
+    # Remove excessive whitespace and normalize. This also leaves no newlines,
+    # so there are no runs of blank lines to collapse afterwards.
+    text = _RE_WS.sub(' ', text.strip())
     
     # Remove common noise patterns
-    text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]', '', text)
+    text = _RE_NOISE.sub('', text)
     
     # Fix common OCR issues
-    text = re.sub(r'(\w)\|(\w)', r'\1l\2', text)  # Fix | -> l
-    text = re.sub(r'(\w)0(\w)', r'\1o\2', text)   # Fix 0 -> o
+    text = _RE_PIPE.sub(r'\1l\2', text)  # Fix | -> l
+    text = _RE_ZERO.sub(r'\1o\2', text)  # Fix 0 -> o
     
     # Remove page numbers and headers
-    text = re.sub(r'Page \d+', '', text)
-    text = re.sub(r'^\d+\s*', '', text, flags=re.MULTILINE)
+    text = _RE_PAGE.sub('', text)
+    text = _RE_LINENUM.sub('', text)
     
     # Clean up bullet points and lists
-    text = re.sub(r'^\s*[•\-\*]\s*', '', text, flags=re.MULTILINE)
-    
-    # Remove excessive newlines
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _RE_BULLET.sub('', text)
     
     # Ensure proper sentence endings
-    text = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', text)
+    text = _RE_SENT.sub(r'\1 \2', text)
     
     return text.strip()
 
-def build_prompt(text, style):
-    """Build enhanced prompts for different summary styles with better accuracy."""
+def summary_cache_key(cleaned_text: str, style: str) -> str:
+    """Cache key for a summary of already preprocessed text."""
+    return llm_cache.make_key(PROMPT_VERSION, style, MODEL_NAME, cleaned_text)
+
+def get_cached_summary(cleaned_text: str, style: str, use_cache: bool = True):
+    """
+    Look up a summary in the exact cache, then the semantic cache.
+    
+    Returns:
+        tuple: (cache_key, cached summary or None; always None when use_cache is False)
+    """
+    cache_key = summary_cache_key(cleaned_text, style)
+    if not use_cache:
+        return cache_key, None
+    cached = llm_cache.get(cache_key)
+    if cached is None:
+        # Near-duplicate documents (whitespace/OCR noise, minor edits)
+        cached = semantic_cache.lookup(cleaned_text, style, MODEL_NAME, PROMPT_VERSION)
+    return cache_key, cached
+
+# Inputs shorter than this many words are already summary-sized
+DIRECT_SUMMARY_MAX_WORDS = 150
+
+def direct_summary(text: str, cleaned_text: str, style: str):
+    """
+    Summary for text that is already summary-sized, without calling Gemini.
+    
+    The result is built from the original text with only its whitespace
+    normalized, since preprocess_text strips symbols and rewrites digits.
+    
+    Args:
+        text (str): The original text
+        cleaned_text (str): Preprocessed text, used for the word count
+        style (str): The style of summary ("bullet", "abstract", or "detailed")
+        
+    Returns:
+        str: The text itself (abstract) or one bullet per sentence (bullet),
+             or None when the text should go to Gemini
+    """
+    if style == "detailed" or cleaned_text.count(' ') + 1 >= DIRECT_SUMMARY_MAX_WORDS:
+        return None
+    normalized = _RE_WS.sub(' ', text).strip()
+    # Callers treat results that look like error messages as failures
+    if normalized.startswith("Error") or "Error generating summary:" in normalized:
+        return None
     if style == "bullet":
-        return f"""Please provide a comprehensive bullet-point summary of the following document. 
+        return '\n'.join(f'• {sentence.strip()}' for sentence in _SENTENCE_BOUNDARY.split(normalized) if sentence.strip())
+    return normalized
+
+def store_summary(cache_key: str, cleaned_text: str, style: str, summary: str) -> None:
+    """Store a generated summary in the exact and semantic caches."""
+    llm_cache.put(cache_key, summary, PROMPT_VERSION, MODEL_NAME)
+    semantic_cache.add(cleaned_text, style, MODEL_NAME, summary, PROMPT_VERSION)
+
+# Fixed instructions that open every prompt, per style; build_prompt places
+# the document between these and STYLE_CLOSING
+STYLE_PREFIX = {
+    "bullet": """Please provide a comprehensive bullet-point summary of the following document. 
 
 Requirements:
 - Extract the most important key points and main ideas
@@ -90,13 +319,8 @@ Requirements:
 - Include relevant facts, figures, and conclusions
 - Ensure accuracy and completeness
 
-Document to summarize:
-{text}
-
-Please provide a well-structured bullet-point summary:"""
-    
-    elif style == "abstract":
-        return f"""Please write a professional abstract summary of the following document.
+""",
+    "abstract": """Please write a professional abstract summary of the following document.
 
 Requirements:
 - 3-4 concise sentences capturing the essence
@@ -105,13 +329,8 @@ Requirements:
 - Maintain factual accuracy
 - Highlight the most significant contributions or insights
 
-Document to summarize:
-{text}
-
-Please provide a professional abstract:"""
-    
-    elif style == "detailed":
-        return f"""Please provide a comprehensive, detailed summary of the following document.
+""",
+    "detailed": """Please provide a comprehensive, detailed summary of the following document.
 
 Requirements:
 - Cover main arguments, supporting evidence, and conclusions
@@ -121,13 +340,10 @@ Requirements:
 - Ensure thorough understanding while maintaining clarity
 - Highlight relationships between different sections/ideas
 
-Document to summarize:
-{text}
+""",
+}
 
-Please provide a detailed summary:"""
-    
-    else:
-        return f"""Please provide a comprehensive summary of the following document.
+_DEFAULT_PREFIX = """Please provide a comprehensive summary of the following document.
 
 Requirements:
 - Identify main themes and key points
@@ -135,18 +351,29 @@ Requirements:
 - Use clear, professional language
 - Highlight important conclusions and implications
 
-Document to summarize:
-{text}
+"""
 
-Please provide a summary:"""
+# Closing request that follows the document, per style
+STYLE_CLOSING = {
+    "bullet": "Please provide a well-structured bullet-point summary:",
+    "abstract": "Please provide a professional abstract:",
+    "detailed": "Please provide a detailed summary:",
+}
+
+def build_prompt(text, style):
+    """Build enhanced prompts for different summary styles with better accuracy."""
+    prefix = STYLE_PREFIX.get(style, _DEFAULT_PREFIX)
+    closing = STYLE_CLOSING.get(style, "Please provide a summary:")
+    return f"{prefix}Document to summarize:\n{text}\n\n{closing}"
 
-def summarize_text(text: str, style: Literal["bullet", "abstract", "detailed"] = "bullet") -> str:
+def summarize_text(text: str, style: Literal["bullet", "abstract", "detailed"] = "bullet", use_cache: bool = True) -> str:
     """
     Generate a summary of the given text using Google Gemini AI.
     
     Args:
         text (str): The text to summarize
         style (str): The style of summary ("bullet", "abstract", or "detailed")
+        use_cache (bool): Set False to skip cached summaries and generate a new one
         
     Returns:
         str: The generated summary
@@ -161,32 +388,34 @@ def summarize_text(text: str, style: Literal["bullet", "abstract", "detailed"] =
         if not cleaned_text:
             return "Error: Text preprocessing resulted in empty content"
         
-        # Use Gemini 1.5 Flash for better performance
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # Text that is already summary-sized is returned without a Gemini call
+        direct = direct_summary(text, cleaned_text, style)
+        if direct is not None:
+            return direct
+        
+        # Serve repeat documents from the persistent response caches
+        cache_key, cached = get_cached_summary(cleaned_text, style, use_cache)
+        if cached is not None:
+            return cached
+        
+        # Long documents are summarized chunk by chunk instead of in one prompt
+        if len(cleaned_text) > LARGE_TEXT_THRESHOLD:
+            return asyncio.run_coroutine_threadsafe(
+                _map_reduce(text, cleaned_text, cache_key, style, use_cache),
+                get_event_loop()
+            ).result()
         
         # Build custom prompt based on style
         prompt = build_prompt(cleaned_text, style)
         
         try:
             # Generate summary with safety settings
-            response = model.generate_content(
-                prompt,
-                safety_settings=[
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                ],
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,  # Lower temperature for more consistent results
-                    top_p=0.8,
-                    top_k=40,
-                    max_output_tokens=2048,
-                )
-            )
+            response = generate_content(prompt, style_generation_config(style))
             
             if response.text:
-                return response.text.strip()
+                summary = response.text.strip()
+                store_summary(cache_key, cleaned_text, style, summary)
+                return summary
             else:
                 return "Error: No summary generated. Please try again."
                 
@@ -196,13 +425,457 @@ def summarize_text(text: str, style: Literal["bullet", "abstract", "detailed"] =
     except Exception as e:
         return f"Error: {str(e)}"
 
-def get_available_models():
-    """Get list of available Gemini models."""
+async def summarize_text_async(text: str, style: Literal["bullet", "abstract", "detailed"] = "bullet", use_cache: bool = True,
+                               limiter: Optional[asyncio.Semaphore] = None) -> str:
+    """
+    Generate a summary like summarize_text without blocking the event loop,
+    so many summaries can overlap their network waits.
+    
+    Args:
+        text (str): The text to summarize
+        style (str): The style of summary ("bullet", "abstract", or "detailed")
+        use_cache (bool): Set False to skip cached summaries and generate a new one
+        limiter (asyncio.Semaphore): Optional limit shared with other callers,
+            held around each Gemini request
+        
+    Returns:
+        str: The generated summary
+    """
+    if not text or not text.strip():
+        return "Error: No text provided for summarization"
+    
     try:
-        models = genai.list_models()
-        return [model.name for model in models if 'gemini' in model.name.lower()]
+        cleaned_text = preprocess_text(text)
+        if not cleaned_text:
+            return "Error: Text preprocessing resulted in empty content"
+        
+        direct = direct_summary(text, cleaned_text, style)
+        if direct is not None:
+            return direct
+        
+        # SQLite reads and the embedding model run off the event loop
+        cache_key, cached = await asyncio.to_thread(get_cached_summary, cleaned_text, style, use_cache)
+        if cached is not None:
+            return cached
+        
+        if len(cleaned_text) > LARGE_TEXT_THRESHOLD:
+            return await _map_reduce(text, cleaned_text, cache_key, style, use_cache, limiter)
+        
+        prompt = build_prompt(cleaned_text, style)
+        
+        try:
+            async with limiter or contextlib.nullcontext():
+                response = await generate_content_async(prompt, style_generation_config(style))
+            
+            if response.text:
+                summary = response.text.strip()
+                await asyncio.to_thread(store_summary, cache_key, cleaned_text, style, summary)
+                return summary
+            else:
+                return "Error: No summary generated. Please try again."
+                
+        except Exception as e:
+            return f"Error generating summary: {str(e)}"
+            
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+# Texts longer than this (in characters) are summarized with map-reduce
+LARGE_TEXT_THRESHOLD = 40_000
+
+# ~6k tokens per chunk, using ~4 characters per token as the estimate
+CHUNK_TOKENS = 6_000
+CHUNK_CHARS = CHUNK_TOKENS * 4
+
+# Chunk summaries requested at once for a single document
+MAP_CONCURRENCY = 8
+
+_PARAGRAPH_BOUNDARY = re.compile(r'\n\s*\n')
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+def _pack(pieces: list, max_chars: int, separator: str) -> list:
+    """Greedily join pieces into chunks of at most max_chars."""
+    chunks = []
+    current = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + len(separator) > max_chars:
+            chunks.append(separator.join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + len(separator)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def split_text(text: str, max_chars: int = CHUNK_CHARS) -> list:
+    """
+    Split text into chunks of at most max_chars, breaking at paragraph
+    boundaries and, for paragraphs longer than a chunk, at sentence boundaries.
+    """
+    pieces = []
+    for paragraph in _PARAGRAPH_BOUNDARY.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        sentences = []
+        for sentence in _SENTENCE_BOUNDARY.split(paragraph):
+            # Hard-split sentences that are longer than a whole chunk
+            while len(sentence) > max_chars:
+                sentences.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            sentences.append(sentence)
+        pieces.extend(_pack(sentences, max_chars, " "))
+    return _pack(pieces, max_chars, "\n\n")
+
+async def _generate_async(prompt: str, generation_config=None) -> str:
+    """Run one Gemini generation without blocking the event loop."""
+    response = await generate_content_async(prompt, generation_config)
+    return response.text.strip()
+
+async def _map_reduce(text: str, cleaned_text: str, cache_key: str, style: str, use_cache: bool = True,
+                      limiter: Optional[asyncio.Semaphore] = None) -> str:
+    """
+    Summarize each chunk as an abstract, then combine them into one summary.
+    
+    Gemini requests hold the caller's limiter when one is given, so a
+    document's chunks count against the caller's concurrency limit;
+    otherwise at most MAP_CONCURRENCY chunks are requested at once.
+    """
+    limiter = limiter or asyncio.Semaphore(MAP_CONCURRENCY)
+    
+    async def summarize_chunk(chunk):
+        # Chunk abstracts are cached on their own, so an edited document
+        # only pays for the chunks that changed
+        return await summarize_text_async(chunk, "abstract", use_cache, limiter)
+    
+    # Map: chunks are split from the raw text so paragraph breaks survive
+    partials = await asyncio.gather(*(summarize_chunk(chunk) for chunk in split_text(text)))
+    for partial in partials:
+        if partial.startswith("Error"):
+            return partial
+    
+    # Reduce: summarize the combined chunk abstracts in the requested style
+    try:
+        async with limiter:
+            summary = await _generate_async(
+                build_prompt("\n\n".join(partials), style),
+                style_generation_config(style)
+            )
+    except Exception as e:
+        return f"Error generating summary: {str(e)}"
+    
+    if not summary:
+        return "Error: No summary generated. Please try again."
+    await asyncio.to_thread(store_summary, cache_key, cleaned_text, style, summary)
+    return summary
+
+def summarize_text_stream(text: str, style: Literal["bullet", "abstract", "detailed"] = "bullet", use_cache: bool = True) -> Iterator[str]:
+    """
+    Generate a summary like summarize_text, yielding chunks as Gemini produces them.
+    
+    Args:
+        text (str): The text to summarize
+        style (str): The style of summary ("bullet", "abstract", or "detailed")
+        use_cache (bool): Set False to skip cached summaries and generate a new one
+        
+    Yields:
+        str: Pieces of the generated summary, or a single error message
+    """
+    if not text or not text.strip():
+        yield "Error: No text provided for summarization"
+        return
+    
+    cleaned_text = preprocess_text(text)
+    if not cleaned_text:
+        yield "Error: Text preprocessing resulted in empty content"
+        return
+    
+    direct = direct_summary(text, cleaned_text, style)
+    if direct is not None:
+        yield direct
+        return
+    
+    # A cached summary is yielded whole
+    cache_key, cached = get_cached_summary(cleaned_text, style, use_cache)
+    if cached is not None:
+        yield cached
+        return
+    
+    try:
+        response = generate_content(
+            build_prompt(cleaned_text, style),
+            style_generation_config(style),
+            stream=True
+        )
+        parts = []
+        for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
+        if parts:
+            store_summary(cache_key, cleaned_text, style, "".join(parts).strip())
     except Exception as e:
-        return f"Error retrieving models: {str(e)}"
+        yield f"Error generating summary: {str(e)}"
+
+# Short style descriptions used when several documents share one prompt
+BATCH_STYLE_INSTRUCTIONS = {
+    "bullet": "a well-structured bullet-point summary of the key points, facts and conclusions",
+    "abstract": "a professional 3-4 sentence abstract covering topic, key findings and conclusions",
+    "detailed": "a comprehensive, detailed summary covering main arguments, evidence and conclusions",
+}
+
+_BATCH_MARKER = re.compile(r'^=== DOCUMENT (\d+) ===\s*$', re.MULTILINE)
+
+def build_batch_prompt(texts: list, style: str) -> str:
+    """Build a single prompt asking for a separate summary of each document."""
+    instruction = BATCH_STYLE_INSTRUCTIONS.get(style, "a comprehensive summary")
+    documents = "\n\n".join(
+        f"<DOC {i}>\n{text}\n</DOC {i}>" for i, text in enumerate(texts, start=1)
+    )
+    return f"""Please summarize each of the following {len(texts)} documents separately.
+
+Requirements:
+- For every document, write {instruction}
+- Do not mix information between documents
+- Start each summary on its own line with the exact marker "=== DOCUMENT <number> ===", using the document's number
+
+Documents to summarize:
+{documents}
+
+Please provide the {len(texts)} summaries in order:"""
+
+def parse_batch_response(response_text: str, count: int) -> list:
+    """Split a batched response into per-document summaries (None where missing)."""
+    summaries = [None] * count
+    markers = list(_BATCH_MARKER.finditer(response_text))
+    for i, marker in enumerate(markers):
+        index = int(marker.group(1)) - 1
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(response_text)
+        summary = response_text[marker.end():end].strip()
+        if 0 <= index < count and summary:
+            summaries[index] = summary
+    return summaries
+
+def summarize_batch(texts: list, style: Literal["bullet", "abstract", "detailed"] = "bullet", use_cache: bool = True) -> list:
+    """
+    Summarize several documents with a single Gemini request.
+    
+    Cached summaries are reused and new ones stored, as in summarize_text;
+    documents the model fails to return a marked summary for are retried
+    individually with summarize_text.
+    
+    Args:
+        texts (list): The texts to summarize
+        style (str): The style of summary ("bullet", "abstract", or "detailed")
+        use_cache (bool): Set False to skip cached summaries and generate a new one
+        
+    Returns:
+        list: One summary (or error message) per input text, in input order
+    """
+    if not texts:
+        return []
+    
+    cleaned_texts = [preprocess_text(text) for text in texts]
+    
+    summaries = [None] * len(texts)
+    for i, cleaned in enumerate(cleaned_texts):
+        if not cleaned:
+            summaries[i] = "Error: Text preprocessing resulted in empty content"
+        else:
+            summaries[i] = direct_summary(texts[i], cleaned, style)
+    
+    cache_keys = {}
+    for i, summary in enumerate(summaries):
+        if summary is None:
+            cache_keys[i], summaries[i] = get_cached_summary(cleaned_texts[i], style, use_cache)
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+    
+    if len(pending) > 1:
+        try:
+            response = generate_content(
+                build_batch_prompt([cleaned_texts[i] for i in pending], style),
+                generation_config=build_generation_config(
+                    min(STYLE_MAX_OUTPUT_TOKENS.get(style, 2048) * len(pending), 8192)
+                )
+            )
+            parsed = parse_batch_response(response.text or "", len(pending))
+            for i, summary in zip(pending, parsed):
+                summaries[i] = summary
+                if summary is not None:
+                    store_summary(cache_keys[i], cleaned_texts[i], style, summary)
+        except Exception:
+            # Fall back to one request per document below
+            pass
+    
+    # Summarize anything the batched request did not cover individually
+    for i in pending:
+        if summaries[i] is None:
+            summaries[i] = summarize_text(texts[i], style, use_cache)
+    
+    return summaries
+
+# Gemini Batch Mode runs asynchronously at half the interactive price
+BATCH_MODEL_NAME = 'gemini-2.5-flash'
+
+_batch_client = None
+
+def _get_batch_client():
+    """Create (once) the google-genai client used for Batch Mode jobs."""
+    global _batch_client
+    if _batch_client is None:
+        from google import genai as genai_sdk
+        _batch_client = genai_sdk.Client(api_key=GEMINI_API_KEY)
+    return _batch_client
+
+# Batch jobs are named "<prefix>-<request count>" so get_batch_job knows how
+# many summaries to return even when trailing requests got no response line
+BATCH_DISPLAY_NAME_PREFIX = "summarize-batch"
+
+def create_batch_job(items: list) -> str:
+    """
+    Submit many summarization requests as a single Gemini Batch Mode job.
+    
+    Args:
+        items (list): (text, style) pairs to summarize
+        
+    Returns:
+        str: The batch job name, used to poll with get_batch_job
+    """
+    lines = []
+    for i, (text, style) in enumerate(items):
+        generation_config = {
+            "temperature": 0.3,
+            "topP": 0.8,
+            "topK": 40,
+            "maxOutputTokens": STYLE_MAX_OUTPUT_TOKENS.get(style, 2048),
+        }
+        if supports_thinking(BATCH_MODEL_NAME):
+            # Summaries don't benefit from thinking; don't pay for its tokens
+            generation_config["thinkingConfig"] = {"thinkingBudget": 0}
+        lines.append(json.dumps({
+            "key": f"req_{i}",
+            "request": {
+                "contents": [{"parts": [{"text": build_prompt(preprocess_text(text), style)}]}],
+                "generationConfig": generation_config,
+            },
+        }))
+    
+    display_name = f"{BATCH_DISPLAY_NAME_PREFIX}-{len(items)}"
+    client = _get_batch_client()
+    uploaded = client.files.upload(
+        file=io.BytesIO("\n".join(lines).encode("utf-8")),
+        config={"display_name": display_name, "mime_type": "jsonl"}
+    )
+    job = client.batches.create(
+        model=BATCH_MODEL_NAME,
+        src=uploaded.name,
+        config={"display_name": display_name}
+    )
+    return job.name
+
+def get_batch_job(job_name: str) -> dict:
+    """
+    Poll a Batch Mode job and collect its summaries once it has succeeded.
+    
+    Args:
+        job_name (str): Name returned by create_batch_job
+        
+    Returns:
+        dict: 'job_id' and 'state', plus 'summaries' (in submission order)
+              when the job state is JOB_STATE_SUCCEEDED
+    """
+    client = _get_batch_client()
+    job = client.batches.get(name=job_name)
+    result = {'job_id': job_name, 'state': job.state.name}
+    
+    if job.state.name == 'JOB_STATE_SUCCEEDED':
+        content = client.files.download(file=job.dest.file_name).decode("utf-8")
+        by_index = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            index = int(entry['key'].split('_', 1)[1])
+            try:
+                text = entry['response']['candidates'][0]['content']['parts'][0]['text']
+                by_index[index] = text.strip()
+            except (KeyError, IndexError):
+                by_index[index] = f"Error generating summary: {entry.get('error', 'no response')}"
+        count = _batch_request_count(job.display_name)
+        if count is None:
+            # Jobs created before the count was recorded
+            count = max(by_index) + 1 if by_index else 0
+        result['summaries'] = [
+            by_index.get(i, "Error generating summary: no response") for i in range(count)
+        ]
+    
+    return result
+
+def _batch_request_count(display_name) -> Optional[int]:
+    """Request count recorded in a batch job's display name by create_batch_job, if any."""
+    prefix = f"{BATCH_DISPLAY_NAME_PREFIX}-"
+    if display_name and display_name.startswith(prefix) and display_name[len(prefix):].isdigit():
+        return int(display_name[len(prefix):])
+    return None
+
+# The model list rarely changes; refetch it at most once an hour
+MODELS_CACHE_TTL_SECONDS = 3600
+
+_models_cache = None
+_models_cached_at = 0.0
+_models_lock = threading.Lock()
+
+def get_available_models(refresh: bool = False):
+    """
+    Get list of available Gemini models.
+    
+    The list is fetched from the API once and reused for
+    MODELS_CACHE_TTL_SECONDS; pass refresh=True to fetch it again now.
+    """
+    global _models_cache, _models_cached_at
+    with _models_lock:
+        if not refresh and _models_cache is not None and time.time() - _models_cached_at < MODELS_CACHE_TTL_SECONDS:
+            return list(_models_cache)
+        try:
+            models = genai.list_models()
+            _models_cache = [model.name for model in models if 'gemini' in model.name.lower()]
+            _models_cached_at = time.time()
+            return list(_models_cache)
+        except Exception as e:
+            return f"Error retrieving models: {str(e)}"
+
+# Words whose presence suggests a summary states its conclusions
+KEY_INDICATORS = ('conclusion', 'summary', 'therefore', 'thus', 'overall', 'key', 'important', 'main')
+
+# Scan for all indicators in one pass: an Aho-Corasick automaton when
+# pyahocorasick is installed, otherwise a case-insensitive alternation
+try:
+    import ahocorasick
+    _INDICATOR_AUTOMATON = ahocorasick.Automaton()
+    for _indicator in KEY_INDICATORS:
+        _INDICATOR_AUTOMATON.add_word(_indicator, _indicator)
+    _INDICATOR_AUTOMATON.make_automaton()
+except ImportError:
+    _INDICATOR_AUTOMATON = None
+
+_RE_INDICATORS = re.compile('|'.join(map(re.escape, KEY_INDICATORS)), re.IGNORECASE)
+
+def _has_key_indicator(summary: str) -> bool:
+    """Whether the summary contains any of KEY_INDICATORS (case-insensitive)."""
+    if _INDICATOR_AUTOMATON is not None:
+        return next(_INDICATOR_AUTOMATON.iter(summary.lower()), None) is not None
+    return _RE_INDICATORS.search(summary) is not None
+
+def _count_stats(text: str) -> tuple:
+    """Count words and sentence-ending punctuation marks."""
+    words = len(text.split())
+    sentences = text.count('.') + text.count('!') + text.count('?')
+    return words, sentences
 
 def evaluate_summary_quality(original_text: str, summary: str) -> dict:
     """
@@ -217,8 +890,8 @@ def evaluate_summary_quality(original_text: str, summary: str) -> dict:
     """
     try:
         # Basic metrics
-        original_length = len(original_text.split())
-        summary_length = len(summary.split())
+        original_length, _ = _count_stats(original_text)
+        summary_length, sentence_count = _count_stats(summary)
         compression_ratio = summary_length / original_length if original_length > 0 else 0
         
         # Quality indicators
@@ -235,13 +908,12 @@ def evaluate_summary_quality(original_text: str, summary: str) -> dict:
             feedback.append("⚠️ Summary might be too verbose")
         
         # Check for key content indicators
-        key_indicators = ['conclusion', 'summary', 'therefore', 'thus', 'overall', 'key', 'important', 'main']
-        if any(indicator in summary.lower() for indicator in key_indicators):
+        if _has_key_indicator(summary):
             quality_score += 20
             feedback.append("✅ Contains key content indicators")
         
         # Check structure
-        if '•' in summary or '-' in summary or '\n' in summary:
+        if any(ch in summary for ch in '•-\n'):
             quality_score += 15
             feedback.append("✅ Well-structured format")
         
@@ -253,8 +925,7 @@ def evaluate_summary_quality(original_text: str, summary: str) -> dict:
             feedback.append("⚠️ Summary might be too short")
         
         # Check for complete sentences
-        sentences = summary.split('.')
-        if len(sentences) >= 2:
+        if sentence_count >= 1:
             quality_score += 20
             feedback.append("✅ Contains complete thoughts")
         
@@ -1,8 +1,21 @@
+import asyncio
+from contextlib import asynccontextmanager
+import anyio
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal, Optional
 import uvicorn
-from backend import summarize_text
+from backend import create_batch_job, get_batch_job, summarize_text_async
+
+# Worker threads available to blocking calls (batch jobs, model listing)
+THREADPOOL_SIZE = 64
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the shared thread pool used by run_in_threadpool."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -10,9 +23,18 @@ app = FastAPI(
     description="AI-powered document summarization using Google Gemini",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Cap concurrent Gemini calls to stay within the API's rate limits
+GEMINI_CONCURRENCY = 8
+_gemini_semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+
+async def _summarize_limited(text: str, style: str) -> str:
+    """Summarize asynchronously; every Gemini request (map-reduce chunks included) holds the shared limit."""
+    return await summarize_text_async(text, style, limiter=_gemini_semaphore)
+
 # Pydantic models for request/response
 class SummarizeRequest(BaseModel):
     text: str = Field(..., min_length=1, description="Text to summarize")
@@ -26,6 +48,20 @@ class SummarizeResponse(BaseModel):
     style: str = Field(..., description="Style used for summarization")
     success: bool = Field(..., description="Whether summarization was successful")
 
+class BatchSummarizeRequest(BaseModel):
+    items: List[SummarizeRequest] = Field(..., min_length=1, description="Documents to summarize")
+
+class BatchJobResponse(BaseModel):
+    job_id: str = Field(..., description="Batch job identifier, used for polling")
+    state: str = Field(..., description="Batch job state")
+    summaries: Optional[List[str]] = Field(
+        default=None,
+        description="Summaries in request order, once the job has succeeded"
+    )
+
+class SummarizeManyResponse(BaseModel):
+    results: List[SummarizeResponse] = Field(..., description="Summaries in request order")
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="API health status")
     message: str = Field(..., description="Health check message")
@@ -64,8 +100,8 @@ async def summarize_document(request: SummarizeRequest):
                 detail="Text cannot be empty"
             )
         
-        # Generate summary using backend
-        summary = summarize_text(request.text, request.style)
+        # Generate summary using backend without blocking the event loop
+        summary = await _summarize_limited(request.text, request.style)
         
         # Check if summarization was successful
         if summary.startswith("Error"):
@@ -90,6 +126,55 @@ async def summarize_document(request: SummarizeRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
+@app.post("/summarize_many", response_model=SummarizeManyResponse)
+async def summarize_many(requests: List[SummarizeRequest]):
+    """
+    Summarize several texts concurrently.
+    
+    Each item takes the same fields as `/summarize`; failed items are
+    returned with `success: false` and the error as the summary.
+    """
+    summaries = await asyncio.gather(
+        *(_summarize_limited(item.text, item.style) for item in requests)
+    )
+    return SummarizeManyResponse(results=[
+        SummarizeResponse(
+            summary=summary,
+            style=item.style,
+            success=not summary.startswith("Error")
+        )
+        for item, summary in zip(requests, summaries)
+    ])
+
+@app.post("/summarize_batch", response_model=BatchJobResponse)
+async def summarize_batch_job(request: BatchSummarizeRequest):
+    """
+    Submit many documents as one Gemini Batch Mode job (asynchronous, 50% cheaper).
+    
+    - **items**: List of text/style pairs to summarize
+    
+    Returns a job id; poll `/summarize_batch/{job_id}` for the results.
+    """
+    try:
+        job_id = await run_in_threadpool(create_batch_job, [(item.text, item.style) for item in request.items])
+        return BatchJobResponse(job_id=job_id, state="JOB_STATE_PENDING")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to create batch job: {str(e)}"
+        )
+
+@app.get("/summarize_batch/{job_id:path}", response_model=BatchJobResponse)
+async def get_summarize_batch_job(job_id: str):
+    """Get the state of a batch job, with its summaries once it has succeeded."""
+    try:
+        return BatchJobResponse(**await run_in_threadpool(get_batch_job, job_id))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get batch job: {str(e)}"
+        )
+
 @app.get("/styles")
 async def get_available_styles():
     """Get available summary styles."""
@@ -118,7 +203,17 @@ async def get_available_models():
     """Get available Gemini models."""
     try:
         from backend import get_available_models
-        models = get_available_models()
+        models = await run_in_threadpool(get_available_models)
+        return {"models": models}
+    except Exception as e:
+        return {"models": [], "error": str(e)}
+
+@app.post("/models/refresh")
+async def refresh_available_models():
+    """Refetch the cached list of Gemini models."""
+    try:
+        from backend import get_available_models
+        models = await run_in_threadpool(get_available_models, refresh=True)
         return {"models": models}
     except Exception as e:
         return {"models": [], "error": str(e)}
@@ -0,0 +1,52 @@
+import pytest
+
+backend = pytest.importorskip("backend")
+
+def test_direct_summary_keeps_numbers_and_punctuation():
+    text = "In 2020 the company's revenue was $100 million,\n up 10% from 2019. Don't panic."
+    cleaned = backend.preprocess_text(text)
+    
+    assert backend.direct_summary(text, cleaned, "abstract") == (
+        "In 2020 the company's revenue was $100 million, up 10% from 2019. Don't panic."
+    )
+    assert backend.direct_summary(text, cleaned, "bullet") == (
+        "• In 2020 the company's revenue was $100 million, up 10% from 2019.\n• Don't panic."
+    )
+
+def test_direct_summary_skips_detailed_and_long_text():
+    short = "A short note."
+    long_text = "word " * backend.DIRECT_SUMMARY_MAX_WORDS
+    
+    assert backend.direct_summary(short, backend.preprocess_text(short), "detailed") is None
+    assert backend.direct_summary(long_text, backend.preprocess_text(long_text), "abstract") is None
+
+def test_direct_summary_skips_text_that_looks_like_an_error():
+    text = "Error rates fell 20% after the March fix. Latency also improved."
+    
+    assert backend.direct_summary(text, backend.preprocess_text(text), "abstract") is None
+    assert backend.direct_summary(text, backend.preprocess_text(text), "bullet") is None
+
+def test_count_stats():
+    assert backend._count_stats("One two three. Four!  Five?\nsix") == (6, 3)
+    assert backend._count_stats("") == (0, 0)
+
+def test_parse_batch_response_orders_and_marks_missing():
+    response = (
+        "=== DOCUMENT 2 ===\nSecond summary.\n\n"
+        "=== DOCUMENT 1 ===\nFirst summary.\n"
+        "=== DOCUMENT 9 ===\nOut of range.\n"
+        "=== DOCUMENT 3 ===\n"
+    )
+    
+    assert backend.parse_batch_response(response, 4) == ["First summary.", "Second summary.", None, None]
+    assert backend.parse_batch_response("no markers here", 2) == [None, None]
+
+def test_split_text_respects_limit_and_keeps_content():
+    paragraphs = ["First sentence. Second sentence.", "x" * 25, "Short one."]
+    text = "\n\n".join(paragraphs)
+    
+    chunks = backend.split_text(text, max_chars=20)
+    
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "").replace("\n", "") == text.replace(" ", "").replace("\n", "")
+    assert backend.split_text("Small text.", max_chars=100) == ["Small text."]
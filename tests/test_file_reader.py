@@ -0,0 +1,25 @@
+from utils.file_reader import _decode_text, extract_text_from_txt
+
+LATE_UNICODE = "a" * 5000 + " café – “quotes” •"
+
+def test_decode_text_utf8_after_ascii_prefix():
+    assert _decode_text(LATE_UNICODE.encode("utf-8")) == LATE_UNICODE
+
+def test_decode_text_latin1_fallback():
+    assert _decode_text("café naïve".encode("latin-1")) == "café naïve"
+
+def test_decode_text_respects_max_chars():
+    assert _decode_text(("ж" * 100).encode("utf-8"), max_chars=10) == "ж" * 10
+
+def test_extract_text_from_txt_utf8_after_ascii_prefix(tmp_path):
+    path = tmp_path / "late.txt"
+    path.write_bytes(LATE_UNICODE.encode("utf-8"))
+    
+    assert extract_text_from_txt(str(path)) == LATE_UNICODE
+    assert extract_text_from_txt(str(path), max_chars=3) == "aaa"
+
+def test_extract_text_from_txt_latin1_fallback(tmp_path):
+    path = tmp_path / "latin1.txt"
+    path.write_bytes("café naïve".encode("latin-1"))
+    
+    assert extract_text_from_txt(str(path)) == "café naïve"
@@ -0,0 +1,49 @@
+from utils import key_pool
+from utils.key_pool import KeyPool
+
+def test_acquire_rotates_and_dedupes():
+    pool = KeyPool(["a", " b ", "a", "", "c"])
+    
+    assert len(pool) == 3
+    assert [pool.acquire() for _ in range(4)] == ["a", "b", "c", "a"]
+
+def test_empty_pool_returns_none():
+    assert KeyPool([]).acquire() is None
+
+def test_penalized_key_is_skipped_until_cooldown_ends(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(key_pool.time, "time", lambda: now[0])
+    pool = KeyPool(["a", "b"])
+    
+    pool.penalize("a", seconds=60)
+    assert [pool.acquire() for _ in range(3)] == ["b", "b", "b"]
+    
+    now[0] += 61
+    assert {pool.acquire(), pool.acquire()} == {"a", "b"}
+
+def test_all_keys_cooling_down_returns_soonest_available(monkeypatch):
+    monkeypatch.setattr(key_pool.time, "time", lambda: 1000.0)
+    pool = KeyPool(["a", "b"])
+    
+    pool.penalize("a", seconds=120)
+    pool.penalize("b", seconds=30)
+    assert pool.acquire() == "b"
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEYS", "k1, k2,")
+    pool = KeyPool.from_env("k3")
+    assert [pool.acquire() for _ in range(3)] == ["k1", "k2", "k3"]
+    assert len(KeyPool.from_env("k1")) == 2
+    
+    monkeypatch.delenv("GEMINI_API_KEYS")
+    assert len(KeyPool.from_env()) == 0
+
+def test_is_rate_limit_error_matches_status_code_only():
+    class ApiError(Exception):
+        def __init__(self, code):
+            super().__init__(f"HTTP {code}")
+            self.code = code
+    
+    assert key_pool.is_rate_limit_error(ApiError(429))
+    assert not key_pool.is_rate_limit_error(ApiError(500))
+    assert not key_pool.is_rate_limit_error(ValueError("payload of 4294967 bytes"))
@@ -0,0 +1,27 @@
+from utils import llm_cache
+
+def _fresh_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "CACHE_PATH", tmp_path / "llm_cache.sqlite")
+    monkeypatch.setattr(llm_cache, "_connection", None)
+
+def test_put_then_get(monkeypatch, tmp_path):
+    _fresh_cache(monkeypatch, tmp_path)
+    key = llm_cache.make_key("text", "bullet")
+    
+    assert llm_cache.get(key) is None
+    llm_cache.put(key, "summary", "v1", "model")
+    assert llm_cache.get(key) == "summary"
+    assert llm_cache.make_key("text", "abstract") != key
+
+def test_expired_entries_are_missed_and_purged(monkeypatch, tmp_path):
+    _fresh_cache(monkeypatch, tmp_path)
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    
+    llm_cache.put("old", "stale", "v1", "model", ttl_seconds=10)
+    now[0] += 11
+    assert llm_cache.get("old") is None
+    
+    llm_cache.put("new", "fresh", "v1", "model")
+    keys = [row[0] for row in llm_cache._connection.execute("SELECT input_hash FROM llm_cache")]
+    assert keys == ["new"]
@@ -0,0 +1,114 @@
+import sys
+import types
+
+from utils import semantic_cache
+
+class FakeModel:
+    max_seq_length = 8
+    
+    def encode(self, texts, normalize_embeddings=True):
+        return [[1.0, 0.0]]
+    
+    def tokenizer(self, text):
+        return {'input_ids': text.split()}
+
+class FakeIndex:
+    """Every stored vector is an exact match for every query."""
+    
+    def __init__(self):
+        self.ids = []
+    
+    @property
+    def ntotal(self):
+        return len(self.ids)
+    
+    def add_with_ids(self, vectors, ids):
+        self.ids.extend(ids)
+    
+    def search(self, vectors, k):
+        return [[1.0] * k], [self.ids[:k]]
+
+class FakeVector(list):
+    def tobytes(self):
+        return b"v"
+    
+    def reshape(self, rows, columns):
+        return [self] * rows
+
+class FakeNumpy:
+    def ascontiguousarray(self, value, dtype=None):
+        return FakeVector(value)
+    
+    def array(self, values, dtype=None):
+        return list(values)
+    
+    def frombuffer(self, data, dtype=None):
+        return FakeVector()
+
+def _fake_state(tmp_path):
+    return {
+        'np': FakeNumpy(),
+        'model': FakeModel(),
+        'index': FakeIndex(),
+        'db': semantic_cache._open_db(tmp_path / "sem_cache.sqlite"),
+        'synced_id': 0,
+    }
+
+def _use_state(monkeypatch, state):
+    monkeypatch.setattr(semantic_cache, "_state", state)
+    return state
+
+def test_lookup_requires_matching_prompt_version(monkeypatch, tmp_path):
+    _use_state(monkeypatch, _fake_state(tmp_path))
+    semantic_cache.add("short text", "bullet", "m", "old summary", "v1")
+    
+    assert semantic_cache.lookup("short text", "bullet", "m", "v1") == "old summary"
+    assert semantic_cache.lookup("short text", "bullet", "m", "v2") is None
+    assert semantic_cache.lookup("short text", "abstract", "m", "v1") is None
+
+def test_lookup_skips_expired_entries(monkeypatch, tmp_path):
+    _use_state(monkeypatch, _fake_state(tmp_path))
+    semantic_cache.add("short text", "bullet", "m", "summary", "v1", ttl_seconds=-1)
+    
+    assert semantic_cache.lookup("short text", "bullet", "m", "v1") is None
+
+def test_texts_longer_than_the_window_are_not_cached(monkeypatch, tmp_path):
+    state = _use_state(monkeypatch, _fake_state(tmp_path))
+    long_text = "word " * 20
+    semantic_cache.add(long_text, "bullet", "m", "summary", "v1")
+    
+    assert state['index'].ntotal == 0
+    semantic_cache.add("short text", "bullet", "m", "summary", "v1")
+    assert semantic_cache.lookup(long_text, "bullet", "m", "v1") is None
+
+def test_processes_sharing_the_database_keep_distinct_rows(monkeypatch, tmp_path):
+    first, second = _fake_state(tmp_path), _fake_state(tmp_path)
+    
+    _use_state(monkeypatch, first)
+    semantic_cache.add("short text", "bullet", "m", "first summary", "v1")
+    _use_state(monkeypatch, second)
+    semantic_cache.add("short text", "abstract", "m", "second summary", "v1")
+    
+    _use_state(monkeypatch, first)
+    assert semantic_cache.lookup("short text", "bullet", "m", "v1") == "first summary"
+    assert semantic_cache.lookup("short text", "abstract", "m", "v1") == "second summary"
+    assert first['index'].ids == second['index'].ids == [1, 2]
+
+def test_model_load_failure_disables_the_cache_once(monkeypatch, tmp_path):
+    attempts = []
+    
+    def failing_model(name):
+        attempts.append(name)
+        raise OSError("offline")
+    
+    monkeypatch.setitem(sys.modules, "faiss", types.ModuleType("faiss"))
+    monkeypatch.setitem(sys.modules, "numpy", types.ModuleType("numpy"))
+    monkeypatch.setitem(sys.modules, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=failing_model))
+    monkeypatch.setattr(semantic_cache, "_DATA_DIR", tmp_path)
+    _use_state(monkeypatch, None)
+    
+    for _ in range(3):
+        semantic_cache.add("short text", "bullet", "m", "summary", "v1")
+        assert semantic_cache.lookup("short text", "bullet", "m", "v1") is None
+    assert len(attempts) == 1
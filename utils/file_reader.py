@@ -1,10 +1,39 @@
+import codecs
+import functools
+import importlib.util
+import io
 import os
+import re
+import zipfile
 import mimetypes
 from typing import Optional, Dict, Any
 from pathlib import Path
 
 # Import format-specific readers
-from .pdf_reader import extract_text_from_pdf, get_pdf_info
+from .pdf_reader import (
+    extract_text_from_pdf,
+    extract_text_from_pdf_bytes,
+    get_pdf_info,
+    get_pdf_info_from_bytes,
+)
+
+# Prefer the C-based lxml parser for BeautifulSoup when it is installed; checked
+# with find_spec so importing this module stays stdlib-only
+_HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+_RE_WS = re.compile(r'\s+')
+
+# Markdown syntax removed by _strip_markdown
+_RE_MD_HEADER = re.compile(r'#+\s+')
+_RE_MD_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_RE_MD_ITALIC = re.compile(r'\*(.*?)\*')
+_RE_MD_CODE = re.compile(r'`(.*?)`')
+_RE_MD_LINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+
+_RE_DOCX_PAGES = re.compile(rb'<Pages>(\d+)</Pages>')
+
+# Text files are read up to this many characters; the rest is never loaded
+MAX_TEXT_CHARS = 500_000
 
 def get_file_info(file_path: str) -> Optional[Dict[str, Any]]:
     """
@@ -16,29 +45,98 @@ def get_file_info(file_path: str) -> Optional[Dict[str, Any]]:
     Returns:
         dict: File information including type, size, pages, etc.
     """
-    if not os.path.exists(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
         return None
     
     file_info = {
         'file_name': os.path.basename(file_path),
-        'file_size_mb': round(os.path.getsize(file_path) / (1024 * 1024), 2),
+        'file_size_mb': round(stat.st_size / (1024 * 1024), 2),
         'file_type': get_file_type(file_path),
         'supported': is_file_supported(file_path)
     }
     
+    # Add format-specific information (cached until the file changes)
+    if file_info['file_type'] == 'pdf':
+        pdf_info = _pdf_info_cached(file_path, stat.st_mtime_ns, stat.st_size)
+        if pdf_info:
+            file_info.update(pdf_info)
+    elif file_info['file_type'] == 'docx':
+        file_info.update(_docx_info_cached(file_path, stat.st_mtime_ns, stat.st_size))
+    
+    return file_info
+
+@functools.lru_cache(maxsize=1024)
+def _pdf_info_cached(file_path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """get_pdf_info memoized on the file's path, modification time and size."""
+    return get_pdf_info(file_path)
+
+@functools.lru_cache(maxsize=1024)
+def _docx_info_cached(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """_get_docx_info memoized on the file's path, modification time and size."""
+    return _get_docx_info(file_path)
+
+def _get_docx_info(source) -> Dict[str, Any]:
+    """Get the page count of a DOCX path or binary stream."""
+    # Word records the real page count in docProps/app.xml; reading it avoids
+    # parsing the whole document
+    page_count = None
+    try:
+        with zipfile.ZipFile(source) as archive:
+            match = _RE_DOCX_PAGES.search(archive.read('docProps/app.xml'))
+            if match:
+                page_count = int(match.group(1))
+    except (KeyError, zipfile.BadZipFile):
+        pass
+    
+    if importlib.util.find_spec('docx') is None:
+        info = {'extractor': 'python-docx (not installed)'}
+        if page_count is not None:
+            info['page_count'] = page_count
+        return info
+    
+    if page_count is not None:
+        return {'page_count': page_count, 'extractor': 'python-docx'}
+    
+    # No page count recorded (e.g. files not saved by Word): estimate it
+    try:
+        import docx
+        if isinstance(source, io.BytesIO):
+            source.seek(0)
+        doc = docx.Document(source)
+        return {
+            'page_count': len(doc.paragraphs) // 20,  # Rough estimate
+            'extractor': 'python-docx'
+        }
+    except Exception:
+        return {}
+
+def get_file_info_from_bytes(data: bytes, file_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get comprehensive information about an in-memory file.
+    
+    Args:
+        data (bytes): Raw file content
+        file_name (str): Original file name, used to determine the file type
+        
+    Returns:
+        dict: File information including type, size, pages, etc.
+    """
+    file_info = {
+        'file_name': file_name,
+        'file_size_mb': round(len(data) / (1024 * 1024), 2),
+        'file_type': get_file_type(file_name),
+        'supported': is_file_supported(file_name)
+    }
+    
     # Add format-specific information
     if file_info['file_type'] == 'pdf':
-        pdf_info = get_pdf_info(file_path)
+        pdf_info = get_pdf_info_from_bytes(data)
         if pdf_info:
             file_info.update(pdf_info)
     elif file_info['file_type'] == 'docx':
-        try:
-            import docx
-            doc = docx.Document(file_path)
-            file_info['page_count'] = len(doc.paragraphs) // 20  # Rough estimate
-            file_info['extractor'] = 'python-docx'
-        except ImportError:
-            file_info['extractor'] = 'python-docx (not installed)'
+        file_info.update(_get_docx_info(io.BytesIO(data)))
     
     return file_info
 
@@ -98,11 +196,47 @@ def extract_text_from_file(file_path: str) -> str:
     except Exception as e:
         return f"Error extracting text from {file_type.upper()}: {str(e)}"
 
+def extract_text_from_bytes(data: bytes, ext: str) -> str:
+    """
+    Extract text from in-memory file content of any supported format.
+    
+    Args:
+        data (bytes): Raw file content
+        ext (str): File extension including the dot, e.g. '.pdf'
+        
+    Returns:
+        str: Extracted text or error message
+    """
+    file_type = get_file_type(f"file{ext}")
+    
+    if file_type == 'unknown':
+        return f"Error: File format '{ext}' is not supported"
+    
+    try:
+        if file_type == 'pdf':
+            return extract_text_from_pdf_bytes(data)
+        elif file_type == 'docx':
+            return _extract_docx_text(io.BytesIO(data))
+        elif file_type == 'txt':
+            return _decode_text(data)
+        elif file_type == 'html':
+            return _extract_html_text(data)
+        elif file_type == 'markdown':
+            return _strip_markdown(_decode_text(data))
+        else:
+            return f"Error: Unsupported file type: {file_type}"
+    except Exception as e:
+        return f"Error extracting text from {file_type.upper()}: {str(e)}"
+
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX files."""
+    return _extract_docx_text(file_path)
+
+def _extract_docx_text(source) -> str:
+    """Extract text from a DOCX path or binary stream."""
     try:
         import docx
-        doc = docx.Document(file_path)
+        doc = docx.Document(source)
         text = ""
         for paragraph in doc.paragraphs:
             if paragraph.text.strip():
@@ -113,57 +247,85 @@ def extract_text_from_docx(file_path: str) -> str:
     except Exception as e:
         return f"Error: Failed to extract text from DOCX: {str(e)}"
 
-def extract_text_from_txt(file_path: str) -> str:
-    """Extract text from TXT files."""
+def extract_text_from_txt(file_path: str, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Extract text from TXT files, reading at most max_chars characters."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except UnicodeDecodeError:
-        try:
-            with open(file_path, 'r', encoding='latin-1') as file:
-                return file.read()
-        except Exception as e:
-            return f"Error: Failed to read TXT file: {str(e)}"
+        return _read_text(file_path, max_chars)
     except Exception as e:
         return f"Error: Failed to read TXT file: {str(e)}"
 
+def _read_text(file_path: str, max_chars: int) -> str:
+    """Read up to max_chars of a text file as UTF-8, falling back to latin-1."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.read(max_chars)
+    except UnicodeDecodeError:
+        with open(file_path, 'r', encoding='latin-1') as file:
+            return file.read(max_chars)
+
+def _decode_text(data: bytes, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Decode up to max_chars of TXT bytes as UTF-8, falling back to latin-1."""
+    # No encoding needs more than 4 bytes per character
+    head = data[:max_chars * 4]
+    try:
+        # The incremental decoder tolerates a character cut off by the slice
+        return codecs.getincrementaldecoder('utf-8')().decode(head, final=len(head) == len(data))[:max_chars]
+    except UnicodeDecodeError:
+        return head.decode('latin-1')[:max_chars]
+
 def extract_text_from_html(file_path: str) -> str:
     """Extract text from HTML files."""
     try:
-        from bs4 import BeautifulSoup
         with open(file_path, 'r', encoding='utf-8') as file:
-            soup = BeautifulSoup(file.read(), 'html.parser')
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            # Get text and clean it up
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            return text
+            return _extract_html_text(file.read())
+    except Exception as e:
+        return f"Error: Failed to extract text from HTML: {str(e)}"
+
+def _extract_html_text(markup) -> str:
+    """Extract visible text from HTML markup (str or bytes)."""
+    # selectolax (C HTML engine) is much faster than BeautifulSoup when installed
+    try:
+        from selectolax.parser import HTMLParser
+        tree = HTMLParser(markup)
+        for tag in tree.css('script, style'):
+            tag.decompose()
+        return _RE_WS.sub(' ', tree.text(separator=' ')).strip()
+    except ImportError:
+        pass
+    except Exception:
+        # Fall back to BeautifulSoup below
+        pass
+    
+    try:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(markup, _HTML_PARSER)
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+        # Get text and collapse whitespace in one pass
+        return _RE_WS.sub(' ', soup.get_text(separator=' ')).strip()
     except ImportError:
         return "Error: beautifulsoup4 is not installed. Install it with: pip install beautifulsoup4"
     except Exception as e:
         return f"Error: Failed to extract text from HTML: {str(e)}"
 
-def extract_text_from_markdown(file_path: str) -> str:
-    """Extract text from Markdown files."""
+def extract_text_from_markdown(file_path: str, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Extract text from Markdown files, reading at most max_chars characters."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            # Simple markdown to text conversion
-            import re
-            # Remove markdown syntax
-            text = re.sub(r'#+\s+', '', content)  # Remove headers
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove bold
-            text = re.sub(r'\*(.*?)\*', r'\1', text)  # Remove italic
-            text = re.sub(r'`(.*?)`', r'\1', text)  # Remove code
-            text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)  # Remove links
-            return text.strip()
+        return _strip_markdown(_read_text(file_path, max_chars))
     except Exception as e:
         return f"Error: Failed to read Markdown file: {str(e)}"
 
+def _strip_markdown(content: str) -> str:
+    """Simple markdown to text conversion."""
+    # Remove markdown syntax
+    text = _RE_MD_HEADER.sub('', content)  # Remove headers
+    text = _RE_MD_BOLD.sub(r'\1', text)  # Remove bold
+    text = _RE_MD_ITALIC.sub(r'\1', text)  # Remove italic
+    text = _RE_MD_CODE.sub(r'\1', text)  # Remove code
+    text = _RE_MD_LINK.sub(r'\1', text)  # Remove links
+    return text.strip()
+
 def get_supported_formats() -> Dict[str, str]:
     """Get list of supported file formats with descriptions."""
     return {
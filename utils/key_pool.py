@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+# Seconds a key is skipped after hitting its rate limit
+DEFAULT_COOLDOWN_SECONDS = 60
+
+class KeyPool:
+    """
+    Round-robin pool of API keys. Keys that hit a rate limit are put on
+    cooldown and skipped until it expires.
+    """
+    
+    def __init__(self, keys: Iterable[str]):
+        self._keys = deque(dict.fromkeys(key.strip() for key in keys if key and key.strip()))
+        self._cooldown_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls, fallback_key: Optional[str] = None) -> "KeyPool":
+        """Build a pool from comma-separated GEMINI_API_KEYS, or a single fallback key."""
+        keys = os.getenv("GEMINI_API_KEYS", "").split(",")
+        if fallback_key:
+            keys.append(fallback_key)
+        return cls(keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def acquire(self) -> Optional[str]:
+        """
+        Return the next key that is not cooling down.
+        
+        Returns:
+            str: A key, the one whose cooldown ends soonest if all are cooling
+                 down, or None if the pool is empty
+        """
+        with self._lock:
+            if not self._keys:
+                return None
+            now = time.time()
+            for _ in range(len(self._keys)):
+                key = self._keys[0]
+                self._keys.rotate(-1)
+                if self._cooldown_until.get(key, 0) <= now:
+                    return key
+            return min(self._keys, key=lambda k: self._cooldown_until.get(k, 0))
+    
+    def penalize(self, key: str, seconds: float = DEFAULT_COOLDOWN_SECONDS) -> None:
+        """Put a key on cooldown after a rate-limit / quota error."""
+        with self._lock:
+            self._cooldown_until[key] = time.time() + seconds
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception is Gemini's 429 / RESOURCE_EXHAUSTED."""
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+        if isinstance(error, ResourceExhausted):
+            return True
+    except ImportError:
+        pass
+    # google-api-core and google-genai errors both carry the HTTP status as .code
+    return getattr(error, "code", None) == 429
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# Cached responses expire after a week by default
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# SQLite file holding the cache (override with LLM_CACHE_PATH)
+CACHE_PATH = Path(os.getenv(
+    "LLM_CACHE_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "llm_cache.sqlite"
+))
+
+_lock = threading.Lock()
+_connection = None
+
+def _connect() -> sqlite3.Connection:
+    """Open (once) the shared cache connection and create the table if needed."""
+    global _connection
+    if _connection is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(CACHE_PATH), check_same_thread=False)
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                input_hash TEXT PRIMARY KEY,
+                prompt_version TEXT,
+                model TEXT,
+                response TEXT,
+                created_at INT,
+                expires_at INT
+            )"""
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS by_expiry ON llm_cache (expires_at)")
+        connection.commit()
+        _connection = connection
+    return _connection
+
+def make_key(*parts: str) -> str:
+    """Build a content-addressed cache key from the parts that determine a response."""
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+def get(key: str) -> Optional[str]:
+    """
+    Look up a cached response.
+    
+    Args:
+        key (str): Cache key from make_key
+        
+    Returns:
+        str: The cached response, or None if missing, expired or the cache is unavailable
+    """
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT response FROM llm_cache WHERE input_hash = ? AND expires_at > ?",
+                (key, int(time.time()))
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+def put(key: str, response: str, prompt_version: str, model: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+    """
+    Store a response in the cache, deleting entries that have expired.
+    Failures are ignored so caching never breaks summarization.
+    
+    Args:
+        key (str): Cache key from make_key
+        response (str): The response text to store
+        prompt_version (str): Version of the prompt that produced the response
+        model (str): Model that produced the response
+        ttl_seconds (int): Seconds until the entry expires
+    """
+    now = int(time.time())
+    try:
+        with _lock:
+            connection = _connect()
+            # Purge expired rows as we go so the file doesn't grow without bound
+            connection.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, prompt_version, model, response, now, now + ttl_seconds)
+            )
+            connection.commit()
+    except sqlite3.Error:
+        pass
@@ -1,15 +1,36 @@
+import importlib
+import importlib.util
+import io
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Default extraction budget (None reads every page); callers that want to stop
+# early pass a character count, and pages after it is reached are not read
+DEFAULT_MAX_CHARS = None
+
+# PyPDF2 / pypdf extraction is spread over a process pool from this many pages,
+# in ranges of PAGES_PER_TASK pages
+PARALLEL_MIN_PAGES = 32
+PAGES_PER_TASK = 8
+
+# Documents averaging fewer text-layer characters per page than this are
+# treated as scanned and OCRed
+OCR_MIN_CHARS_PER_PAGE = 20
+
+def extract_text_from_pdf(file_path: str, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
     """
-    Extract text from a PDF file using PyPDF2 or pypdf as fallback.
+    Extract text from a PDF file using PyMuPDF, with PyPDF2 or pypdf as fallback.
     
     Args:
         file_path (str): Path to the PDF file
+        max_chars (int, optional): Stop reading pages once this much text is
+            extracted; None (the default) reads the whole document
         
     Returns:
-        str: Extracted text from all pages, or empty string if extraction fails
+        str: Extracted text (up to about max_chars), or an error/warning message
     """
     # Check if file exists
     if not os.path.exists(file_path):
@@ -19,25 +40,257 @@ def extract_text_from_pdf(file_path: str) -> str:
     if not file_path.lower().endswith('.pdf'):
         return f"Error: File '{file_path}' is not a PDF"
     
-    extracted_text = ""
+    return _extract_text_from_pdf_source(file_path, max_chars)
+
+def extract_text_from_pdf_bytes(data: bytes, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
+    """
+    Extract text from in-memory PDF bytes without writing them to disk.
     
-    # Try PyPDF2 first
+    Args:
+        data (bytes): Raw PDF file content
+        max_chars (int, optional): Stop reading pages once this much text is
+            extracted; None (the default) reads the whole document
+        
+    Returns:
+        str: Extracted text (up to about max_chars), or an error/warning message
+    """
+    return _extract_text_from_pdf_source(io.BytesIO(data), max_chars)
+
+# PyMuPDF is not thread-safe, even across separate documents, and uploads are
+# extracted from several threads at once
+_pymupdf_lock = threading.Lock()
+
+def _open_pymupdf(source):
+    """Open a PDF path or binary stream with PyMuPDF."""
+    import pymupdf
+    if isinstance(source, io.BytesIO):
+        return pymupdf.open(stream=source.getvalue(), filetype="pdf")
+    return pymupdf.open(source)
+
+def _ocr_available() -> bool:
+    """Whether pytesseract and Pillow are installed."""
+    return importlib.util.find_spec("pytesseract") is not None and importlib.util.find_spec("PIL") is not None
+
+def _render_page(page):
+    """Render a PyMuPDF page for OCR as a PIL image, or None if rendering fails."""
+    from PIL import Image
     try:
-        import PyPDF2
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Extract text from all pages
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
+        pix = page.get_pixmap(dpi=300)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    except Exception:
+        return None
+
+def _ocr_image(image) -> Optional[str]:
+    """
+    OCR a rendered page image.
+    
+    Returns:
+        str: The page's text ("" if OCR failed on this page), or None when the
+             tesseract binary is missing
+    """
+    import pytesseract
+    try:
+        return pytesseract.image_to_string(image)
+    except pytesseract.TesseractNotFoundError:
+        return None
+    except Exception:
+        return ""
+
+def _extract_with_pymupdf(source, max_chars: int) -> str:
+    """Extract text with PyMuPDF, falling back to OCR for scanned documents."""
+    with _pymupdf_lock:
+        doc = _open_pymupdf(source)
+    try:
+        with _pymupdf_lock:
+            page_count = doc.page_count
+            page_texts = []
+            total_chars = 0
+            for page in doc:
+                page_texts.append(page.get_text("text").strip())
+                total_chars += len(page_texts[-1])
+                if total_chars >= max_chars:
+                    break
+        
+        # OCR is slow (seconds per page), so only run it when the document as a
+        # whole has next to no text layer, not for the odd blank or figure page.
+        # Pages are rendered under the lock but OCRed outside it, so a scan
+        # doesn't hold up PyMuPDF work in other threads.
+        if total_chars < OCR_MIN_CHARS_PER_PAGE * page_count and _ocr_available():
+            for page_num, page_text in enumerate(page_texts):
                 if page_text:
-                    extracted_text += f"\n--- Page {page_num + 1} ---\n"
-                    extracted_text += page_text.strip()
-                    extracted_text += "\n"
-            
-            if extracted_text.strip():
-                return extracted_text.strip()
+                    continue
+                with _pymupdf_lock:
+                    image = _render_page(doc[page_num])
+                if image is None:
+                    continue
+                ocr_text = _ocr_image(image)
+                if ocr_text is None:
+                    break
+                page_texts[page_num] = ocr_text.strip()
+        
+        parts = []
+        total_chars = 0
+        for page_num, page_text in enumerate(page_texts):
+            if page_text:
+                parts.append(_format_page(page_num, page_text))
+                total_chars += len(parts[-1])
+                if total_chars >= max_chars:
+                    break
+        return "".join(parts).strip()
+    finally:
+        with _pymupdf_lock:
+            doc.close()
+
+# PDFium is not thread-safe; uploads are extracted from several threads at once
+_pdfium_lock = threading.Lock()
+
+def _extract_with_pypdfium2(source, max_chars: int) -> str:
+    """Extract text with pypdfium2 (Google's PDFium, a C library)."""
+    import pypdfium2 as pdfium
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source.getvalue() if isinstance(source, io.BytesIO) else source)
+        try:
+            parts = []
+            total_chars = 0
+            for page_num in range(len(pdf)):
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                try:
+                    page_text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                if page_text.strip():
+                    parts.append(_format_page(page_num, page_text))
+                    total_chars += len(parts[-1])
+                    if total_chars >= max_chars:
+                        break
+            return "".join(parts).strip()
+        finally:
+            pdf.close()
+
+def _format_page(page_num: int, page_text: str) -> str:
+    """Format one page's text with the page separator used by every extractor."""
+    return f"\n--- Page {page_num + 1} ---\n{page_text.strip()}\n"
+
+# Worker-process state for parallel PyPDF2 / pypdf extraction
+_worker_reader = None
+
+def _init_page_worker(reader_module: str, source) -> None:
+    """Open the PDF once per worker process."""
+    global _worker_reader
+    module = importlib.import_module(reader_module)
+    _worker_reader = module.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+def _extract_page_range(start: int, stop: int) -> list:
+    """Extract pages [start, stop) in a worker process."""
+    parts = []
+    for page_num in range(start, stop):
+        page_text = _worker_reader.pages[page_num].extract_text()
+        if page_text:
+            parts.append(_format_page(page_num, page_text))
+    return parts
+
+def _extract_with_reader(reader_module: str, source, max_chars: int, parallel: bool = True) -> str:
+    """
+    Extract text page by page with PyPDF2 or pypdf.
+    
+    Both are pure Python and CPU-bound, so unless parallel is False, long PDFs
+    are split into page ranges that a process pool extracts in parallel;
+    results keep page order.
+    """
+    module = importlib.import_module(reader_module)
+    pdf_reader = module.PdfReader(source)
+    page_count = len(pdf_reader.pages)
+    workers = min(os.cpu_count() or 1, -(-page_count // PAGES_PER_TASK))
+    
+    if parallel and page_count >= PARALLEL_MIN_PAGES and workers > 1:
+        try:
+            return _extract_in_parallel(reader_module, source, page_count, workers, max_chars)
+        except Exception:
+            # Process pools can be unavailable (e.g. restricted sandboxes); extract serially
+            pass
+    
+    parts = []
+    total_chars = 0
+    for page_num, page in enumerate(pdf_reader.pages):
+        page_text = page.extract_text()
+        if page_text:
+            parts.append(_format_page(page_num, page_text))
+            total_chars += len(parts[-1])
+            if total_chars >= max_chars:
+                break
+    return "".join(parts).strip()
+
+def _extract_in_parallel(reader_module: str, source, page_count: int, workers: int, max_chars: int) -> str:
+    """Extract page ranges across a process pool, stopping once max_chars is reached."""
+    worker_source = source.getvalue() if isinstance(source, io.BytesIO) else source
+    starts = list(range(0, page_count, PAGES_PER_TASK))
+    stops = [min(start + PAGES_PER_TASK, page_count) for start in starts]
+    
+    parts = []
+    total_chars = 0
+    # Spawned workers: forking a process that already runs threads (Streamlit,
+    # uvicorn's thread pool, the upload extraction pool) can deadlock
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_page_worker,
+        initargs=(reader_module, worker_source)
+    )
+    try:
+        for range_parts in executor.map(_extract_page_range, starts, stops):
+            parts.extend(range_parts)
+            total_chars += sum(len(part) for part in range_parts)
+            if total_chars >= max_chars:
+                break
+    finally:
+        # Drop ranges that are no longer needed once the budget is met
+        executor.shutdown(wait=False, cancel_futures=True)
+    return "".join(parts).strip()
+
+def _extract_text_from_pdf_source(source, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
+    """Extract text from a PDF path or binary stream using PyMuPDF or pypdfium2, then PyPDF2 or pypdf as fallback."""
+    # Set once a native extractor has read the document and found no text (e.g. a
+    # scan): the pure-Python readers then won't find much either, so they run
+    # without spinning up a process pool
+    native_read = False
+    
+    # The extractors compare against the budget, so "unlimited" becomes infinity
+    if max_chars is None:
+        max_chars = float('inf')
+    
+    # Try PyMuPDF first (native MuPDF parser, much faster than the pure-Python readers)
+    try:
+        extracted_text = _extract_with_pymupdf(source, max_chars)
+        if extracted_text:
+            return extracted_text
+        native_read = True
+    except ImportError:
+        # PyMuPDF not available, try pypdfium2
+        pass
+    except Exception:
+        # PyMuPDF failed, try pypdfium2
+        pass
+    
+    # Try pypdfium2 next (PDFium, also native)
+    try:
+        extracted_text = _extract_with_pypdfium2(source, max_chars)
+        if extracted_text:
+            return extracted_text
+        native_read = True
+    except ImportError:
+        # pypdfium2 not available, try PyPDF2
+        pass
+    except Exception:
+        # pypdfium2 failed, try PyPDF2
+        pass
+    
+    # Try PyPDF2 next
+    try:
+        extracted_text = _extract_with_reader('PyPDF2', source, max_chars, parallel=not native_read)
+        if extracted_text:
+            return extracted_text
                 
     except ImportError:
         # PyPDF2 not available, try pypdf
@@ -48,24 +301,12 @@ def extract_text_from_pdf(file_path: str) -> str:
     
     # Try pypdf as fallback
     try:
-        import pypdf
-        with open(file_path, 'rb') as file:
-            pdf_reader = pypdf.PdfReader(file)
-            
-            # Extract text from all pages
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                if page_text:
-                    extracted_text += f"\n--- Page {page_num + 1} ---\n"
-                    extracted_text += page_text.strip()
-                    extracted_text += "\n"
-            
-            if extracted_text.strip():
-                return extracted_text.strip()
+        extracted_text = _extract_with_reader('pypdf', source, max_chars, parallel=not native_read)
+        if extracted_text:
+            return extracted_text
                 
     except ImportError:
-        return "Error: Neither PyPDF2 nor pypdf is installed"
+        return "Error: None of PyMuPDF, pypdfium2, PyPDF2 or pypdf is installed"
     except Exception as e:
         return f"Error: Failed to extract text from PDF: {str(e)}"
     
@@ -85,30 +326,75 @@ def get_pdf_info(file_path: str) -> Optional[dict]:
     if not os.path.exists(file_path):
         return None
     
+    return _get_pdf_info_from_source(file_path, os.path.getsize(file_path))
+
+def get_pdf_info_from_bytes(data: bytes) -> Optional[dict]:
+    """
+    Get basic information about in-memory PDF bytes.
+    
+    Args:
+        data (bytes): Raw PDF file content
+        
+    Returns:
+        dict: PDF information including page count, file size, etc.
+    """
+    return _get_pdf_info_from_source(io.BytesIO(data), len(data))
+
+def _get_pdf_info_from_source(source, size_bytes: int) -> Optional[dict]:
+    """Get PDF information from a path or binary stream."""
     try:
-        # Try PyPDF2 first
+        # Try PyMuPDF first
+        try:
+            with _pymupdf_lock:
+                doc = _open_pymupdf(source)
+                try:
+                    return {
+                        'page_count': doc.page_count,
+                        'file_size_mb': round(size_bytes / (1024 * 1024), 2),
+                        'extractor': 'PyMuPDF'
+                    }
+                finally:
+                    doc.close()
+        except ImportError:
+            pass
+        
+        # Try pypdfium2 next
+        try:
+            import pypdfium2 as pdfium
+            with _pdfium_lock:
+                pdf = pdfium.PdfDocument(source.getvalue() if isinstance(source, io.BytesIO) else source)
+                try:
+                    return {
+                        'page_count': len(pdf),
+                        'file_size_mb': round(size_bytes / (1024 * 1024), 2),
+                        'extractor': 'pypdfium2'
+                    }
+                finally:
+                    pdf.close()
+        except ImportError:
+            pass
+        
+        # Try PyPDF2 next
         try:
             import PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                return {
-                    'page_count': len(pdf_reader.pages),
-                    'file_size_mb': round(os.path.getsize(file_path) / (1024 * 1024), 2),
-                    'extractor': 'PyPDF2'
-                }
+            pdf_reader = PyPDF2.PdfReader(source)
+            return {
+                'page_count': len(pdf_reader.pages),
+                'file_size_mb': round(size_bytes / (1024 * 1024), 2),
+                'extractor': 'PyPDF2'
+            }
         except ImportError:
             pass
         
         # Try pypdf as fallback
         try:
             import pypdf
-            with open(file_path, 'rb') as file:
-                pdf_reader = pypdf.PdfReader(file)
-                return {
-                    'page_count': len(pdf_reader.pages),
-                    'file_size_mb': round(os.path.getsize(file_path) / (1024 * 1024), 2),
-                    'extractor': 'pypdf'
-                }
+            pdf_reader = pypdf.PdfReader(source)
+            return {
+                'page_count': len(pdf_reader.pages),
+                'file_size_mb': round(size_bytes / (1024 * 1024), 2),
+                'extractor': 'pypdf'
+            }
         except ImportError:
             pass
             
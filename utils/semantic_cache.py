@@ -0,0 +1,184 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .llm_cache import DEFAULT_TTL_SECONDS
+
+# Reuse a stored summary when cosine similarity is at least this high
+SIMILARITY_THRESHOLD = 0.95
+
+# Sentence embedding model (384-dimensional)
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# SQLite file holding summaries and their embeddings. It is the only thing
+# persisted: the Streamlit and FastAPI processes share it, and each keeps its
+# own in-memory FAISS index in sync with it
+_DATA_DIR = Path(os.getenv("SEMANTIC_CACHE_DIR", Path(__file__).resolve().parent.parent / "data"))
+DB_PATH = _DATA_DIR / "sem_cache.sqlite"
+
+_logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_state = None
+
+def _open_db(path: Path) -> sqlite3.Connection:
+    """Open the row table, creating it if needed."""
+    connection = sqlite3.connect(str(path), check_same_thread=False)
+    # AUTOINCREMENT never reuses the id of a purged row, which an index built
+    # before the purge may still return
+    connection.execute(
+        """CREATE TABLE IF NOT EXISTS sem_cache (
+            row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            embedding BLOB,
+            summary TEXT,
+            style TEXT,
+            model TEXT,
+            prompt_version TEXT,
+            created_at INT,
+            expires_at INT
+        )"""
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS sem_by_expiry ON sem_cache (expires_at)")
+    connection.commit()
+    return connection
+
+def _load():
+    """
+    Load the embedding model, FAISS index and row table once.
+    
+    Returns:
+        dict: Loaded state, or None when sentence-transformers/faiss are not
+              installed or the model could not be loaded (not retried)
+    """
+    global _state
+    if _state is not None:
+        return _state or None
+    try:
+        import faiss
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        _state = {}
+        return None
+    
+    try:
+        _DATA_DIR.mkdir(parents=True, exist_ok=True)
+        model = SentenceTransformer(EMBEDDING_MODEL)
+        model.max_seq_length = 512
+        # Inner product over normalized vectors is cosine similarity; vectors
+        # are stored under their SQLite row_id
+        index = faiss.IndexIDMap(faiss.IndexFlatIP(model.get_sentence_embedding_dimension()))
+        connection = _open_db(DB_PATH)
+    except Exception as e:
+        # e.g. the model can't be downloaded on an offline host
+        _logger.warning("Semantic cache disabled: %s", e)
+        _state = {}
+        return None
+    
+    _state = {'np': np, 'model': model, 'index': index, 'db': connection, 'synced_id': 0}
+    return _state
+
+def _sync(state) -> None:
+    """Add rows stored since the last sync, by this or another process, to the index."""
+    rows = state['db'].execute(
+        "SELECT row_id, embedding FROM sem_cache WHERE row_id > ? ORDER BY row_id",
+        (state['synced_id'],)
+    ).fetchall()
+    if not rows:
+        return
+    np = state['np']
+    ids = np.array([row[0] for row in rows], dtype='int64')
+    vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype='float32').reshape(len(rows), -1)
+    state['index'].add_with_ids(vectors, ids)
+    state['synced_id'] = rows[-1][0]
+
+def _fits_window(state, text: str) -> bool:
+    """
+    Whether the whole text fits in the embedding model's input window.
+    
+    Longer texts would be embedded from their opening tokens only, so documents
+    sharing a title page or front matter would look identical.
+    """
+    max_tokens = state['model'].max_seq_length
+    # No tokenizer averages more than ~10 characters per token; skip tokenizing huge texts
+    if len(text) > max_tokens * 10:
+        return False
+    return len(state['model'].tokenizer(text)['input_ids']) <= max_tokens
+
+def _embed(state, text: str):
+    """Embed text as a normalized float32 row vector."""
+    embedding = state['model'].encode([text], normalize_embeddings=True)
+    return state['np'].ascontiguousarray(embedding, dtype='float32')
+
+def lookup(text: str, style: str, model: str, prompt_version: str) -> Optional[str]:
+    """
+    Find a stored, unexpired summary for a near-duplicate of the given text.
+    
+    Args:
+        text (str): Preprocessed document text
+        style (str): Summary style that must match
+        model (str): Model name that must match
+        prompt_version (str): Prompt version that must match
+        
+    Returns:
+        str: The stored summary, or None if nothing is similar enough (or the
+             text is too long to embed whole)
+    """
+    try:
+        with _lock:
+            state = _load()
+            if state is None or not _fits_window(state, text):
+                return None
+            _sync(state)
+            if state['index'].ntotal == 0:
+                return None
+            scores, ids = state['index'].search(_embed(state, text), min(5, state['index'].ntotal))
+            for score, row_id in zip(scores[0], ids[0]):
+                if score < SIMILARITY_THRESHOLD:
+                    break
+                row = state['db'].execute(
+                    "SELECT summary FROM sem_cache WHERE row_id = ? AND style = ? AND model = ?"
+                    " AND prompt_version = ? AND expires_at > ?",
+                    (int(row_id), style, model, prompt_version, int(time.time()))
+                ).fetchone()
+                if row:
+                    return row[0]
+    except Exception:
+        return None
+    return None
+
+def add(text: str, style: str, model: str, summary: str, prompt_version: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+    """
+    Store a generated summary under the embedding of its source text.
+    Failures are ignored so caching never breaks summarization.
+    
+    Args:
+        text (str): Preprocessed document text
+        style (str): Summary style
+        model (str): Model that produced the summary
+        summary (str): The generated summary
+        prompt_version (str): Version of the prompt that produced the summary
+        ttl_seconds (int): Seconds until the entry expires
+    """
+    now = int(time.time())
+    try:
+        with _lock:
+            state = _load()
+            if state is None or not _fits_window(state, text):
+                return
+            # Purge expired rows as we go so the file doesn't grow without bound
+            state['db'].execute("DELETE FROM sem_cache WHERE expires_at <= ?", (now,))
+            state['db'].execute(
+                "INSERT INTO sem_cache (embedding, summary, style, model, prompt_version, created_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_embed(state, text).tobytes(), summary, style, model, prompt_version, now, now + ttl_seconds)
+            )
+            state['db'].commit()
+            _sync(state)
+    except Exception:
+        pass